@@ -0,0 +1,210 @@
+import os
+import time
+import sqlite3
+import datetime
+from dates import parse_date
+
+# --- CONFIG ---
+STORE_PATH = os.getenv("ARTICLE_STORE", "articles.db")
+
+SCRAPED = 'scraped'
+SELECTED = 'selected'
+APPROVED = 'approved'
+VETOED = 'vetoed'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    link TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    source TEXT,
+    published TEXT,
+    published_ts REAL,
+    image TEXT,
+    caption TEXT,
+    status TEXT NOT NULL DEFAULT 'scraped',
+    selected_on TEXT,
+    scraped_on TEXT,
+    dirty INTEGER NOT NULL DEFAULT 1,
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS articles_published ON articles (published_ts);
+CREATE INDEX IF NOT EXISTS articles_status ON articles (status, published_ts);
+CREATE INDEX IF NOT EXISTS articles_selected_on ON articles (selected_on);
+CREATE INDEX IF NOT EXISTS articles_dirty ON articles (dirty);
+"""
+
+COLUMNS = ['link', 'title', 'source', 'published', 'published_ts', 'image', 'caption',
+           'status', 'selected_on', 'scraped_on', 'dirty', 'updated_at']
+
+# --- HELPERS ---
+def published_timestamp(published):
+    try:
+        return parse_date(published).timestamp()
+    except Exception:
+        return None
+
+def _row_to_article(row):
+    return dict(zip(COLUMNS, row))
+
+# --- ARTICLE STORE ---
+class ArticleStore:
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def _write(self, sql, rows):
+        # One explicit transaction per batch; autocommit would fsync every row.
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.executemany(sql, rows)
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    def _select(self, where, params=(), order="published_ts DESC", limit=None):
+        sql = f"SELECT {', '.join(COLUMNS)} FROM articles WHERE {where} ORDER BY {order}"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return [_row_to_article(r) for r in self.conn.execute(sql, params)]
+
+    # --- WRITES ---
+    def upsert_articles(self, articles, day=None):
+        day = day or datetime.date.today().isoformat()
+        now = time.time()
+        rows = [
+            (a['link'], a['title'], a.get('source', ''), a.get('published', ''),
+             published_timestamp(a.get('published', '')), a.get('image') or '', day, now)
+            for a in articles if a.get('link')
+        ]
+        self._write(
+            "INSERT INTO articles (link, title, source, published, published_ts, image, scraped_on, updated_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT(link) DO UPDATE SET"
+            "  title = excluded.title, source = excluded.source, published = excluded.published,"
+            "  published_ts = excluded.published_ts,"
+            "  image = CASE WHEN excluded.image != '' THEN excluded.image ELSE articles.image END,"
+            "  dirty = 1, updated_at = excluded.updated_at",
+            rows
+        )
+        return len(rows)
+
+    def mark_selected(self, articles, day=None):
+        day = day or datetime.date.today().isoformat()
+        self.upsert_articles(articles, day)
+        self._write(
+            "UPDATE articles SET status = ?, selected_on = ?, dirty = 1, updated_at = ?"
+            " WHERE link = ? AND status = ?",
+            [(SELECTED, day, time.time(), a['link'], SCRAPED) for a in articles if a.get('link')]
+        )
+
+    def set_captions(self, captions_by_link):
+        self._write(
+            "UPDATE articles SET caption = ?, dirty = 1, updated_at = ?"
+            " WHERE link = ? AND IFNULL(caption, '') != ?",
+            [(caption, time.time(), link, caption) for link, caption in captions_by_link.items()]
+        )
+
+    def set_status(self, links, status):
+        self._write(
+            "UPDATE articles SET status = ?, dirty = 1, updated_at = ? WHERE link = ? AND status != ?",
+            [(status, time.time(), link, status) for link in links]
+        )
+
+    def replace_selection(self, articles, day):
+        # A rerun replaces the day's picks. Earlier picks that were only selected
+        # go back to scraped but keep selected_on, so the sync can find and remove
+        # their rows from that day's selects tab.
+        links = {a['link'] for a in articles if a.get('link')}
+        earlier = self.conn.execute(
+            "SELECT link FROM articles WHERE selected_on = ? AND status = ?", (day, SELECTED)
+        ).fetchall()
+        self._write(
+            "UPDATE articles SET status = ?, dirty = 1, updated_at = ? WHERE link = ?",
+            [(SCRAPED, time.time(), link) for link, in earlier if link not in links]
+        )
+        self.mark_selected(articles, day)
+
+    def apply_sheet_rows(self, rows):
+        # Rows pulled from the selects tab that the store has not seen:
+        # (title, link, source, published, caption, image, status, day).
+        now = time.time()
+        self._write(
+            "INSERT INTO articles (title, link, source, published, published_ts, caption, image, status,"
+            "  selected_on, scraped_on, dirty, updated_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0, ?)"
+            " ON CONFLICT(link) DO NOTHING",
+            [(title, link, source, published, published_timestamp(published), caption, image, status, day, day, now)
+             for title, link, source, published, caption, image, status, day in rows]
+        )
+
+    def apply_sheet_edits(self, edits):
+        # (link, caption, status) from the selects tab for articles already in the
+        # store. Local edits that have not been pushed yet (dirty rows) win over the sheet.
+        self._write(
+            "UPDATE articles SET caption = ?, status = ?, selected_on = IFNULL(selected_on, scraped_on), updated_at = ?"
+            " WHERE link = ? AND dirty = 0 AND (IFNULL(caption, '') != ? OR status != ?)",
+            [(caption, status, time.time(), link, caption, status) for link, caption, status in edits]
+        )
+
+    def mark_synced(self, links):
+        self._write("UPDATE articles SET dirty = 0 WHERE link = ?", [(link,) for link in links])
+
+    # --- QUERIES ---
+    def get(self, link):
+        rows = self._select("link = ?", (link,))
+        return rows[0] if rows else None
+
+    def known_links(self, links):
+        links, known = list(links), set()
+        for i in range(0, len(links), 500):
+            chunk = links[i:i + 500]
+            sql = f"SELECT link FROM articles WHERE link IN ({', '.join('?' for _ in chunk)})"
+            known.update(link for link, in self.conn.execute(sql, chunk))
+        return known
+
+    def published_between(self, start_ts, end_ts=None, statuses=None, limit=None):
+        where, params = "published_ts >= ?", [start_ts]
+        if end_ts is not None:
+            where += " AND published_ts < ?"
+            params.append(end_ts)
+        if statuses:
+            where += f" AND status IN ({', '.join('?' for _ in statuses)})"
+            params += list(statuses)
+        return self._select(where, params, limit=limit)
+
+    def recent_selected(self, days=3, limit=5, include_vetoed=False):
+        statuses = [SELECTED, APPROVED] + ([VETOED] if include_vetoed else [])
+        return self.published_between(time.time() - days * 86400, statuses=statuses, limit=limit)
+
+    def selected(self, include_vetoed=False, limit=None):
+        statuses = [SELECTED, APPROVED] + ([VETOED] if include_vetoed else [])
+        where = f"status IN ({', '.join('?' for _ in statuses)})"
+        return self._select(where, statuses, limit=limit)
+
+    def labelled_titles(self, since_day, exclude_day=None):
+        # (title, label) pairs for the pre-ranker: kept selects are positives,
+        # vetoed selects and scraped-but-not-selected headlines are negatives.
+        # exclude_day drops the run's own candidates (and any earlier picks
+        # from a rerun that day), which have no verdict yet.
+        rows = self.conn.execute(
+            "SELECT title, status FROM articles WHERE IFNULL(selected_on, scraped_on) >= ?"
+            " AND IFNULL(scraped_on, '') != ? AND IFNULL(selected_on, '') != ? ORDER BY rowid",
+            (since_day, exclude_day or '', exclude_day or '')
+        )
+        return [(title.strip(), 1 if status in (SELECTED, APPROVED) else 0) for title, status in rows if title.strip()]
+
+    def dirty(self, statuses=None):
+        where, params = "dirty = 1", []
+        if statuses:
+            where += f" AND status IN ({', '.join('?' for _ in statuses)})"
+            params = list(statuses)
+        return self._select(where, params, order="published_ts ASC")
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
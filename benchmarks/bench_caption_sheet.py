@@ -0,0 +1,88 @@
+# benchmarks/bench_caption_sheet.py
+#
+# Counts Sheets API calls and wall time for writing captions into the
+# selects tab as the tab grows. Captions go to the store and push_selects
+# sends only the changed cells, so the sync should stay at three calls
+# (open the tab, one column batch_get, one batchUpdate) regardless of size.
+# Run from the repo root: python benchmarks/bench_caption_sheet.py
+
+import os
+import io
+import sys
+import time
+import tempfile
+import contextlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fakes import FakeSpreadsheet
+from article_store import ArticleStore
+from sheets_sync import SELECTS_HEADERS, push_selects
+
+TAB = "August 2026 (selects)"
+DAY = "2026-08-14"
+
+def sheet_row(i):
+    return [f"Headline {i}", f"https://example.com/{i}", "Source", "Thu, 14 Aug 2026 12:00:00 +0000", "",
+            "", "", "2026-08-14T12:00:00Z"]
+
+def build_sheet(rows):
+    spreadsheet = FakeSpreadsheet()
+    worksheet = spreadsheet.add_worksheet(TAB, rows_data=[SELECTS_HEADERS] + [sheet_row(i) for i in range(rows)])
+    spreadsheet.calls.clear()
+    return spreadsheet, worksheet
+
+def build_store(path, rows):
+    # The store already holds every row on the tab, in sync.
+    store = ArticleStore(path)
+    articles = [dict(zip(['title', 'link', 'source', 'published'], sheet_row(i))) for i in range(rows)]
+    store.mark_selected(articles, day=DAY)
+    store.mark_synced(a['link'] for a in articles)
+    return store
+
+def legacy_update(worksheet, final_articles):
+    # The pre-batching implementation: nested scan plus one update per row.
+    data = worksheet.get_all_values()
+    headers, rows = data[0], data[1:]
+    caption_col_index = headers.index('Caption')
+    updates = []
+    for i, row in enumerate(rows):
+        for article in final_articles:
+            if article['title'].strip() == row[0].strip():
+                while len(row) <= caption_col_index:
+                    row.append("")
+                row[caption_col_index] = article['caption']
+                updates.append((i + 2, row))
+    for row_num, row_data in updates:
+        worksheet.update(f"A{row_num}", [row_data])
+
+def main():
+    print(f"{'rows':>8} {'captions':>9} {'legacy calls':>13} {'legacy ms':>10} {'synced calls':>13} {'synced ms':>10}")
+    tmp = tempfile.mkdtemp()
+    for rows in (100, 1000, 10000):
+        articles = [{'title': f"Headline {i}", 'link': f"https://example.com/{i}", 'caption': f"Caption {i}"}
+                    for i in list(range(rows - 5, rows)) + list(range(0, rows, max(rows // 20, 1)))]
+
+        spreadsheet, worksheet = build_sheet(rows)
+        start = time.perf_counter()
+        legacy_update(worksheet, articles)
+        legacy_ms = (time.perf_counter() - start) * 1000
+        legacy_calls = spreadsheet.api_calls
+
+        spreadsheet, worksheet = build_sheet(rows)
+        store = build_store(os.path.join(tmp, f"articles-{rows}.db"), rows)
+        start = time.perf_counter()
+        store.set_captions({a['link']: a['caption'] for a in articles})
+        with contextlib.redirect_stdout(io.StringIO()):
+            push_selects(store, spreadsheet)
+        synced_ms = (time.perf_counter() - start) * 1000
+        synced_calls = spreadsheet.api_calls
+        store.close()
+
+        assert synced_calls == 3, spreadsheet.calls
+        assert worksheet.rows[rows][4] == f"Caption {rows - 1}"
+        assert len(worksheet.rows) == rows + 1
+        print(f"{rows:>8} {len(articles):>9} {legacy_calls:>13} {legacy_ms:>10.1f} {synced_calls:>13} {synced_ms:>10.1f}")
+
+if __name__ == '__main__':
+    main()
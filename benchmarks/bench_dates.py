@@ -0,0 +1,82 @@
+# benchmarks/bench_dates.py
+#
+# Times the stdlib-first date parser against dateutil over 50k sheet rows,
+# and the "which rows are from this day" filter done by parsing the free-form
+# Published column versus comparing the normalized ISO UTC column as strings.
+# Run from the repo root: python benchmarks/bench_dates.py
+
+import os
+import sys
+import random
+import time
+import datetime
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytz
+from dateutil import parser as dateutil_parser
+import dates
+from sheets_batch import find_rows_for_date
+
+ROWS = 50000
+PACIFIC = pytz.timezone("America/Los_Angeles")
+OFFSETS = ['+0000', '-0400', '-0700', 'GMT', 'EDT']
+
+def build_rows(n, seed=7):
+    rng = random.Random(seed)
+    start = datetime.datetime(2026, 9, 1, tzinfo=datetime.timezone.utc)
+    published = []
+    for _ in range(n):
+        moment = start + datetime.timedelta(seconds=rng.randrange(30 * 86400))
+        kind = rng.random()
+        if kind < 0.85:
+            published.append(moment.strftime('%a, %d %b %Y %H:%M:%S ') + rng.choice(OFFSETS))
+        elif kind < 0.97:
+            published.append(moment.strftime('%Y-%m-%dT%H:%M:%S+00:00'))
+        else:
+            published.append(moment.strftime('%B %d, %Y %I:%M %p'))
+    return published
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+def main():
+    warnings.simplefilter('ignore')
+    published = build_rows(ROWS)
+
+    slow, t_dateutil = timed(lambda: [dateutil_parser.parse(p) for p in published])
+    dates.parse_date.cache_clear()
+    fast, t_cold = timed(lambda: [dates.parse_date(p) for p in published])
+    _, t_warm = timed(lambda: [dates.parse_date(p) for p in published])
+    # dateutil drops US zone names like "EDT" (naive result, with a warning);
+    # parsedate_to_datetime applies them. Everything else must agree exactly.
+    differs = [p for p, a, b in zip(published, slow, fast) if a != b]
+    assert all(p.endswith('EDT') for p in differs), differs[:3]
+
+    print(f"{ROWS:,} Published values")
+    print(f"  dateutil.parser.parse   {t_dateutil * 1000:8.1f} ms")
+    print(f"  dates.parse_date (cold) {t_cold * 1000:8.1f} ms  {t_dateutil / t_cold:5.1f}x")
+    print(f"  dates.parse_date (warm) {t_warm * 1000:8.1f} ms  {t_dateutil / t_warm:5.1f}x")
+    print(f"  {len(differs):,} 'EDT' values now keep their offset instead of parsing as naive")
+
+    # Day-block lookup as replace_day_rows does it, with and without the ISO column.
+    date_cells = [[p] for p in published]
+    iso_cells = [[dates.iso_utc(p)] for p in published]
+    day = '2026-09-15'
+    dates.parse_date.cache_clear()
+    by_parse, t_parse = timed(lambda: find_rows_for_date(date_cells, day, PACIFIC))
+    by_iso, t_iso = timed(lambda: find_rows_for_date(date_cells, day, PACIFIC, iso_cells))
+    # Naive (zone-less) values are read as UTC in the ISO column but as local
+    # time by astimezone(); only compare rows that carry an explicit offset.
+    aware = {i + 1 for i, p in enumerate(published) if dates.parse_date(p).tzinfo is not None}
+    assert [r for r in by_parse if r in aware] == [r for r in by_iso if r in aware]
+
+    print(f"\nrows on {day} (PST): {len(by_iso)}")
+    print(f"  parse Published column  {t_parse * 1000:8.1f} ms")
+    print(f"  compare ISO UTC column  {t_iso * 1000:8.1f} ms  {t_parse / t_iso:5.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+# benchmarks/bench_http_client.py
+#
+# Runs the shared HTTP layer against a local keep-alive server and checks
+# that connections are reused, that 429/503 responses are retried with
+# backoff, that the User-Agent is sent, and that per-host rate limits hold.
+# Both the sync session (image_resolver) and the async feed fetcher are covered.
+# Run from the repo root: python benchmarks/bench_http_client.py
+
+import os
+import sys
+import time
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import http_client
+from http_client import HostRateLimiter, build_session
+from feed_fetcher import fetch_feeds
+
+PAGE = b'<html><head><meta property="og:image" content="https://img.example/x.jpg"></head><body></body></html>'
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    connections = set()
+    requests = Counter()
+    user_agents = set()
+    failures_left = {}
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with self.lock:
+            self.connections.add(self.client_address)
+            self.requests[self.path] += 1
+            self.user_agents.add(self.headers.get('User-Agent'))
+            fail = self.failures_left.get(self.path, 0)
+            if fail:
+                self.failures_left[self.path] = fail - 1
+        if fail:
+            status = 429 if self.path.startswith('/throttled') else 503
+            self.send_response(status)
+            if status == 429:
+                self.send_header('Retry-After', '0')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, *args):
+        pass
+
+def reset(failures=None):
+    Handler.connections.clear()
+    Handler.requests.clear()
+    Handler.user_agents.clear()
+    Handler.failures_left = dict(failures or {})
+
+def main():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    http_client.BACKOFF_FACTOR = 0.01
+    http_client.BACKOFF_JITTER = 0.01
+
+    # Keep-alive: 50 sequential GETs should share a single socket.
+    reset()
+    session = build_session()
+    for i in range(50):
+        session.get(f"{base}/page/{i}", timeout=5).content
+    print(f"sync keep-alive:   50 requests over {len(Handler.connections)} connection(s)")
+    assert len(Handler.connections) == 1
+    assert Handler.user_agents == {http_client.USER_AGENT}
+
+    # Retries: two 503s then a 200, and a 429 with Retry-After.
+    reset({'/flaky': 2, '/throttled': 1})
+    assert session.get(f"{base}/flaky", timeout=5).status_code == 200
+    assert session.get(f"{base}/throttled", timeout=5).status_code == 200
+    print(f"sync retries:      /flaky served after {Handler.requests['/flaky']} attempts, "
+          f"/throttled after {Handler.requests['/throttled']}")
+    assert Handler.requests['/flaky'] == 3 and Handler.requests['/throttled'] == 2
+
+    # Per-host rate limit: 5 requests at 0.1s spacing take at least 0.4s.
+    limited = build_session(limiter=HostRateLimiter({'127.0.0.1': 0.1}))
+    start = time.perf_counter()
+    for i in range(5):
+        limited.get(f"{base}/limited/{i}", timeout=5).content
+    elapsed = time.perf_counter() - start
+    print(f"sync rate limit:   5 requests in {elapsed:.2f}s (min 0.40s)")
+    assert elapsed >= 0.4
+
+    # Async feed fetcher: retries and pooled connections.
+    reset({'/feed/flaky': 2})
+    urls = [f"{base}/feed/{i}" for i in range(20)] + [f"{base}/feed/flaky"]
+    results = fetch_feeds(urls, concurrency=5, host_timeouts={})
+    flaky = results[-1]
+    print(f"async feeds:       {len(urls)} feeds over {len(Handler.connections)} connection(s), "
+          f"flaky feed HTTP {flaky['status']} after {flaky['attempts']} attempts")
+    assert all(r['status'] == 200 for r in results)
+    assert flaky['attempts'] == 3
+    assert len(Handler.connections) <= 5
+    assert Handler.user_agents == {http_client.USER_AGENT}
+
+    server.shutdown()
+    print("\n✅ Shared HTTP layer reuses connections, retries 429/5xx and honours rate limits")
+
+if __name__ == '__main__':
+    main()
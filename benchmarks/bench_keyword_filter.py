@@ -0,0 +1,98 @@
+# benchmarks/bench_keyword_filter.py
+#
+# Times the compiled keyword filter against the old per-keyword substring
+# scan, and checks the word-boundary cases the substring scan got wrong as
+# well as the titles it rightly excluded, which must stay excluded.
+# Run from the repo root: python benchmarks/bench_keyword_filter.py
+
+import os
+import sys
+import json
+import random
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from keyword_filter import KeywordFilter
+
+WORDS = ("tour album live festival announces drops new single video stage headline band singer "
+         "stadium record release show fans night anniversary deluxe reissue collab remix").split()
+
+def substring_excluded(title, keywords):
+    title_lower = title.lower()
+    return any(keyword.rstrip('*') in title_lower for keyword in keywords)
+
+def check_correctness():
+    with open(os.path.join(ROOT, 'filters.json'), 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    keyword_filter = KeywordFilter.from_config(config)
+    keywords = config["excluded_keywords"]
+
+    cases = [
+        ("Kendrick Lamar Wins Big at the Award Show", False),
+        ("Nine Inch Nails Revisit Their Industrial Roots", False),
+        ("Courtney Barnett Announces Tour", False),
+        ("The War on Drugs Share New Single", False),
+        ("Rapper Arrested After Show", True),
+        ("Band Sued in Copyright Lawsuit", True),
+        ("Singer Speaks Out Against War", True),
+        ("Trial Date Set for Producer", True),
+    ]
+    # Demonyms and derived forms the substring scan caught; the config marks
+    # their stems with '*' (or lists the form) so word matching keeps them.
+    kept = [
+        "Russian Rapper Detained After Moscow Show",
+        "Israeli Singer Withdraws From Eurovision",
+        "Iranian Band Banned From Performing",
+        "Ukrainian Pop Star Plays Benefit Gig",
+        "Palestinian Artist's Exhibit Pulled",
+        "Terrorist Attack at Festival",
+        "Terrorism Fears Hit Summer Tours",
+        "Protesters Gather Outside Arena",
+        "Scandalous Claims Surface About Label Boss",
+        "Former Manager Named as Abuser",
+        "Courtroom Sketches of Producer Released",
+        "Wartime Songs Get a Reissue",
+    ]
+    cases += [(title, True) for title in kept]
+    for title, expected in cases:
+        got = keyword_filter.is_excluded(title)
+        assert got == expected, f"{title!r}: expected excluded={expected}, got {got}"
+    false_positives = sum(1 for title, expected in cases if not expected and substring_excluded(title, keywords))
+    assert all(substring_excluded(title, keywords) for title in kept)
+    print(f"Correctness: {len(cases)} cases pass (substring scan gets {false_positives} false positive(s), "
+          f"and both exclude all {len(kept)} stem/derived-form titles)")
+
+def main():
+    check_correctness()
+
+    random.seed(7)
+    terms = sorted({''.join(random.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(random.randint(4, 10)))
+                    for _ in range(500)})
+    titles = []
+    for _ in range(10000):
+        words = [random.choice(WORDS) for _ in range(random.randint(6, 14))]
+        if random.random() < 0.1:
+            words.insert(random.randrange(len(words)), random.choice(terms))
+        titles.append(' '.join(words).title())
+
+    start = time.perf_counter()
+    keyword_filter = KeywordFilter(terms)
+    compile_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    naive = [substring_excluded(t, terms) for t in titles]
+    naive_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    compiled = [keyword_filter.is_excluded(t) for t in titles]
+    compiled_ms = (time.perf_counter() - start) * 1000
+
+    print(f"{len(titles):,} titles x {len(terms)} terms")
+    print(f"Substring scan:  {naive_ms:8.1f} ms ({sum(naive)} excluded)")
+    print(f"Compiled regex:  {compiled_ms:8.1f} ms ({sum(compiled)} excluded, compiled in {compile_ms:.1f} ms)")
+    print(f"Speed-up:        {naive_ms / compiled_ms:.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+# benchmarks/bench_og_image.py
+#
+# Compares the streaming head-only og:image scanner against the old
+# full-page BeautifulSoup path on a synthetic, Rolling Stone-sized page.
+# Run from the repo root: python benchmarks/bench_og_image.py
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+from image_resolver import HEAD_CHUNK_SIZE, scan_head_for_image
+
+IMAGE_URL = 'https://www.rollingstone.com/wp-content/uploads/2026/08/cover.jpg'
+
+def build_page(head_scripts=40, body_paragraphs=20000):
+    head = ['<html><head><title>Article</title>']
+    for i in range(head_scripts):
+        head.append(f'<script>window.__data_{i} = {{"k": "{"x" * 1500}"}};</script>')
+    head.append(f'<meta property="og:image" content="{IMAGE_URL}">')
+    head.append(f'<meta name="twitter:image" content="{IMAGE_URL}">')
+    head.append('</head><body>')
+    body = [f'<p class="para">Paragraph {i} of the article body.</p>' for i in range(body_paragraphs)]
+    return ''.join(head + body + ['</body></html>']).encode('utf-8')
+
+def chunked(data, size=HEAD_CHUNK_SIZE):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+def soup_image(page):
+    soup = BeautifulSoup(page.decode('utf-8'), 'html.parser')
+    og_image = soup.find("meta", property="og:image")
+    if og_image and og_image.get("content"):
+        return og_image["content"]
+    twitter_image = soup.find("meta", attrs={"name": "twitter:image"})
+    if twitter_image and twitter_image.get("content"):
+        return twitter_image["content"]
+    return None
+
+def timed(fn, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+def main():
+    page = build_page()
+
+    soup_result, soup_time = timed(lambda: soup_image(page))
+    (stream_result, bytes_read), stream_time = timed(lambda: scan_head_for_image(chunked(page)))
+
+    assert soup_result == IMAGE_URL, soup_result
+    assert stream_result == IMAGE_URL, stream_result
+    assert bytes_read < len(page)
+
+    print(f"Page size:       {len(page):>10,} bytes")
+    print(f"BeautifulSoup:   {len(page):>10,} bytes read, {soup_time * 1000:8.2f} ms")
+    print(f"Head-only scan:  {bytes_read:>10,} bytes read, {stream_time * 1000:8.2f} ms")
+    print(f"Speed-up:        {soup_time / stream_time:.1f}x, {len(page) / bytes_read:.1f}x fewer bytes")
+
+if __name__ == '__main__':
+    main()
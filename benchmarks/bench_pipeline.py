@@ -0,0 +1,303 @@
+# benchmarks/bench_pipeline.py
+#
+# Offline benchmark of every stage of the daily pipeline at 10, 1k and 100k
+# articles. Feeds and article pages come from the recorded fixtures in
+# benchmarks/fixtures via a local server, OpenAI is a local stub (stubs.py)
+# and Google Sheets is the in-memory fake (fakes.py), so nothing leaves the
+# machine. Each stage reports wall time, API calls and peak traced memory.
+#
+#   --scales 10,1000        pick the scales to run (100k takes several minutes,
+#                           mostly resolving the fixture feeds' missing images)
+#   --no-memory             skip tracemalloc; traced runs are several times slower,
+#                           so only compare runs made with the same setting
+#   --save results.json     write the numbers out
+#   --baseline results.json fail if a stage got slower or chattier than that run
+#
+# Run from the repo root: python benchmarks/bench_pipeline.py
+
+import os
+import sys
+import io
+import json
+import random
+import shutil
+import time
+import asyncio
+import argparse
+import datetime
+import tempfile
+import tracemalloc
+import contextlib
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import pytz
+from fakes import FakeSpreadsheet, FakeSheetsService
+from stubs import StubProcess, headline
+
+SCALES = [10, 1000, 100000]
+# Stages that make one request per article are capped so a 100k run finishes
+# in minutes; capped rows are marked in the report.
+STAGE_CAPS = {'extract_image': 10000, 'captions': 1000}
+TIME_TOLERANCE = 1.5
+PACIFIC = pytz.timezone("America/Los_Angeles")
+
+# --- ENVIRONMENT ---
+def setup(workdir, openai_url):
+    # Everything that would touch disk or credentials is pointed at workdir
+    # before the pipeline modules are imported.
+    os.environ['CACHE_DIR'] = os.path.join(workdir, 'cache')
+    os.environ['OPENAI_BASE_URL'] = openai_url
+    os.environ['OPENAI_API_KEY'] = 'stub'
+    os.environ['SHEET_ID'] = 'bench'
+    os.environ['CREDS_B64'] = 'bench'
+    os.environ['LLM_CACHE_BYPASS'] = '1'
+    os.environ['ARTICLE_STORE'] = os.path.join(workdir, 'articles.db')
+    # The scripts read filters.json and write feed.xml relative to the cwd.
+    shutil.copy(os.path.join(REPO_ROOT, 'filters.json'), workdir)
+    os.chdir(workdir)
+    # Import cost is bench_startup.py's job; keep it out of the first stage timings.
+    import rss_scraper_bot, gpt_top_article_selector, caption_generator, rss_writer
+    import feedparser, aiohttp, openai, pre_ranker
+    pre_ranker.prior_weights()
+
+def reset_state(workdir, spreadsheet):
+    import clients
+    import llm_cache
+    import image_resolver
+    import caption_generator
+    import rss_writer
+    from sqlite_cache import SqliteCache
+
+    clients.spreadsheet = lambda name=None: spreadsheet
+    clients.sheets_service = lambda: FakeSheetsService(spreadsheet)
+    clients.openai_client.cache_clear()
+    clients.async_openai_client.cache_clear()
+    llm_cache.LLM_CACHE_BYPASS = True
+    path = os.path.join(workdir, f"images-{time.time_ns()}.sqlite")
+    image_resolver._image_cache = SqliteCache(path, ttl=image_resolver.IMAGE_CACHE_TTL)
+    for usage in (caption_generator.USED_PHRASES, caption_generator.PHRASE_POSITION_COUNTS,
+                  caption_generator.USED_INTROS):
+        usage.clear()
+    rss_writer._tab_cache.clear()
+    rss_writer.TAB_CACHE_PATH = os.path.join(workdir, 'sheet_tabs.json')
+    for name in ('feed.xml', 'feed_all.xml', os.environ['ARTICLE_STORE']):
+        if os.path.exists(name):
+            os.remove(name)
+
+# --- SHEET FIXTURES ---
+def sheet_rows(n, start_day, days, selects):
+    # n history rows spread over `days` days ending at start_day, newest last.
+    rng = random.Random(n)
+    rows = []
+    for i in range(n):
+        day = start_day - datetime.timedelta(days=(n - 1 - i) * days // max(n, 1))
+        moment = datetime.datetime.combine(day, datetime.time(20, i % 60), tzinfo=datetime.timezone.utc)
+        published = moment.strftime('%a, %d %b %Y %H:%M:%S +0000')
+        link = f"https://example.com/history/{i}"
+        if selects:
+            rows.append([headline(10 ** 7 + i, rng), link, 'Example', published, f"Caption {i}",
+                         f"https://img.example/{i}.jpg", '❌' if i % 50 == 0 else '',
+                         moment.strftime('%Y-%m-%dT%H:%M:%SZ')])
+        else:
+            rows.append([headline(10 ** 7 + i, rng), link, 'Example', published,
+                         f"https://img.example/{i}.jpg", moment.strftime('%Y-%m-%dT%H:%M:%SZ')])
+    return rows
+
+def build_spreadsheet(n):
+    from sheets_sync import MONTHLY_HEADERS, SELECTS_HEADERS
+    spreadsheet = FakeSpreadsheet()
+    now = datetime.datetime.now(PACIFIC)
+    yesterday = (now - datetime.timedelta(days=1)).date()
+    spreadsheet.add_worksheet(now.strftime('%B %Y'),
+                              rows_data=[MONTHLY_HEADERS] + sheet_rows(n, yesterday, 28, selects=False))
+    # rss_writer names tabs by the runner's local date; cover both months it may read.
+    today = datetime.datetime.now().date()
+    previous = today.replace(day=1) - datetime.timedelta(days=1)
+    spreadsheet.add_worksheet(previous.strftime('%B %Y (selects)'),
+                              rows_data=[SELECTS_HEADERS] + sheet_rows(n // 2, previous, 28, selects=True))
+    spreadsheet.add_worksheet(now.strftime('%B %Y (selects)'),
+                              rows_data=[SELECTS_HEADERS] + sheet_rows(n - n // 2, now.date(), 28, selects=True))
+    spreadsheet.calls.clear()
+    return spreadsheet
+
+# --- STAGES ---
+def stage_fetch(ctx):
+    import rss_scraper_bot
+    from feed_cache import FeedCache
+    rss_scraper_bot.RSS_FEEDS = ctx['feeds']
+    ctx['articles'] = rss_scraper_bot.fetch_recent_articles(cache=FeedCache(os.path.join(ctx['workdir'], 'feeds')))
+    return len(ctx['articles'])
+
+def stage_extract_image(ctx, limit):
+    import image_resolver
+    urls = ctx['stubs'].article_urls(limit, offset=ctx['n'])
+    images = image_resolver.resolve_images(urls)
+    assert all(images), "fixture pages all carry an og:image"
+    return len(images)
+
+def stage_rank(ctx):
+    import gpt_top_article_selector
+    from pre_ranker import PreRanker
+    ctx['top'] = gpt_top_article_selector.rank_top_articles(ctx['articles'], 5, PreRanker())
+    return len(ctx['top'])
+
+def stage_captions(ctx, limit):
+    import caption_generator
+    articles = ctx['articles'][:limit]
+    captions = asyncio.run(caption_generator.generate_captions(articles))
+    by_title = {a['title']: c for a, c in zip(articles, captions)}
+    for article in ctx['top']:
+        article['caption'] = by_title.get(article['title'], caption_generator.FALLBACK_CAPTION)
+    return len(captions)
+
+def stage_monthly_sheet(ctx):
+    import rss_scraper_bot
+    rss_scraper_bot.update_monthly_sheet(ctx['articles'])
+    return min(len(ctx['articles']), rss_scraper_bot.MAX_RESULTS)
+
+def stage_record_selects(ctx):
+    import gpt_top_article_selector
+    gpt_top_article_selector.record_selects(ctx['top'])
+    return len(ctx['top'])
+
+def stage_store_captions(ctx):
+    from article_store import ArticleStore
+    ArticleStore().set_captions({a['link']: a['caption'] for a in ctx['top']})
+    return len(ctx['top'])
+
+def stage_sync(ctx):
+    import sheets_sync
+    sheets_sync.main()
+    return len(ctx['top'])
+
+def stage_rss(ctx, loadAll):
+    import rss_writer
+    rss_writer.generate_rss(loadAll=loadAll)
+    output = 'feed_all.xml' if loadAll else 'feed.xml'
+    return sum(1 for _ in rss_writer.iter_feed_items(output))
+
+def stages(n):
+    image_limit = min(n, STAGE_CAPS['extract_image'])
+    caption_limit = min(n, STAGE_CAPS['captions'])
+    return [
+        ('fetch_recent_articles', stage_fetch, n),
+        ('extract_image', lambda ctx: stage_extract_image(ctx, image_limit), image_limit),
+        ('rank_top_articles', stage_rank, n),
+        ('generate_captions', lambda ctx: stage_captions(ctx, caption_limit), caption_limit),
+        ('update_monthly_sheet', stage_monthly_sheet, n),
+        ('record_selects', stage_record_selects, n),
+        ('store_captions', stage_store_captions, n),
+        ('sheets_sync', stage_sync, n),
+        ('generate_rss', lambda ctx: stage_rss(ctx, False), n),
+        ('generate_rss(loadAll)', lambda ctx: stage_rss(ctx, True), n),
+    ]
+
+# --- MEASUREMENT ---
+def api_calls(ctx):
+    calls = ctx['stubs'].stats()
+    calls.update({f"sheets.{k}": v for k, v in ctx['spreadsheet'].calls.items()})
+    return calls
+
+def measure(ctx, fn, memory):
+    before = api_calls(ctx)
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        items = fn(ctx)
+    elapsed = time.perf_counter() - start
+    peak = 0
+    if memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    calls = api_calls(ctx)
+    calls.subtract(before)
+    return {'seconds': elapsed, 'items': items, 'peak_bytes': peak, 'calls': {k: v for k, v in calls.items() if v}}
+
+def run_scale(n, stubs, workdir, memory):
+    spreadsheet = build_spreadsheet(n)
+    reset_state(workdir, spreadsheet)
+    ctx = {'n': n, 'stubs': stubs, 'spreadsheet': spreadsheet, 'workdir': workdir,
+           'feeds': stubs.publish_feeds(n)}
+    results = {}
+    for name, fn, size in stages(n):
+        result = measure(ctx, fn, memory)
+        result['capped'] = size < n
+        results[name] = result
+    return results
+
+# --- REPORT ---
+def format_calls(calls):
+    return ', '.join(f"{k.split('.', 1)[1]}×{v}" for k, v in sorted(calls.items())) or '-'
+
+def report(n, results, memory):
+    print(f"\n📏 {n:,} articles")
+    print(f"  {'stage':28} {'wall':>9} {'items':>8} {'peak MiB':>9}  api calls")
+    for name, r in results.items():
+        peak = f"{r['peak_bytes'] / 2 ** 20:9.1f}" if memory else f"{'-':>9}"
+        capped = ' (capped)' if r['capped'] else ''
+        print(f"  {name:28} {r['seconds'] * 1000:7.0f}ms {r['items']:8,} {peak}  {format_calls(r['calls'])}{capped}")
+
+def compare(baseline, results, tolerance):
+    # Times only count as a regression past the tolerance and a 50ms floor,
+    # so noise on the tiny stages doesn't fail the run. Call counts must not grow.
+    failures = []
+    for scale, stages_ in results.items():
+        for name, r in stages_.items():
+            old = baseline.get(scale, {}).get(name)
+            if not old:
+                continue
+            if r['seconds'] > old['seconds'] * tolerance and r['seconds'] - old['seconds'] > 0.05:
+                failures.append(f"{scale} {name}: {old['seconds']:.3f}s -> {r['seconds']:.3f}s")
+            for call, count in r['calls'].items():
+                if count > old['calls'].get(call, 0):
+                    failures.append(f"{scale} {name}: {call} {old['calls'].get(call, 0)} -> {count}")
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--scales', default=','.join(str(s) for s in SCALES))
+    parser.add_argument('--no-memory', action='store_true', help="Skip tracemalloc peak memory")
+    parser.add_argument('--save', help="Write results to this JSON file")
+    parser.add_argument('--baseline', help="Compare against a saved results file")
+    parser.add_argument('--tolerance', type=float, default=TIME_TOLERANCE)
+    args = parser.parse_args()
+    save = os.path.abspath(args.save) if args.save else None
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline['memory'] == args.no_memory:
+            sys.exit("❌ Baseline was recorded with a different --no-memory setting")
+
+    stubs = StubProcess()
+    workdir = tempfile.mkdtemp(prefix='bench-pipeline-')
+    setup(workdir, stubs.openai_url)
+
+    memory = not args.no_memory
+    results = {}
+    try:
+        for n in (int(s) for s in args.scales.split(',')):
+            results[str(n)] = run_scale(n, stubs, workdir, memory)
+            report(n, results[str(n)], memory)
+    finally:
+        stubs.close()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if save:
+        with open(save, 'w', encoding='utf-8') as f:
+            json.dump({'memory': memory, 'results': results}, f, indent=2)
+        print(f"\n💾 Results saved to {save}")
+    if baseline is not None:
+        failures = compare(baseline['results'], results, args.tolerance)
+        if failures:
+            print("\n❌ Regressions against baseline:")
+            for failure in failures:
+                print(f"  {failure}")
+            sys.exit(1)
+        print("\n✅ No regressions against baseline")
+
+if __name__ == '__main__':
+    main()
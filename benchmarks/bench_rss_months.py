@@ -0,0 +1,100 @@
+# benchmarks/bench_rss_months.py
+#
+# Exercises rss_writer.load_articles_from_sheets against a fake Sheets v4
+# service across a month boundary: on the 1st the "last 3 days" window has to
+# reach back into the previous month's selects tab, every tab in the window
+# comes back from one values.batchGet, and tab metadata is only fetched once.
+# Run from the repo root: python benchmarks/bench_rss_months.py
+
+import os
+import sys
+import datetime
+import tempfile
+import contextlib
+import io
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import rss_writer
+from fakes import FakeSpreadsheet, FakeSheetsService
+
+HEADER = ['Title', 'Link', 'Source', 'Published', 'Caption', 'Image', 'Approval']
+
+def row(day, n, approval=''):
+    published = day.strftime('%a, %d %b %Y 12:00:00 +0000')
+    return [f"Story {day.isoformat()} #{n}", f"https://example.com/{day.isoformat()}/{n}", 'Example',
+            published, f"Caption {n}", f"https://img.example/{n}.jpg", approval]
+
+def build_sheet(today):
+    spreadsheet = FakeSpreadsheet()
+    previous = today - datetime.timedelta(days=1)
+    # Last month: two selects on each of its final three days, one vetoed with
+    # the dashboard's mark and one with the reply handler's.
+    prev_rows = [HEADER]
+    vetoes = {0: '🚫 Vetoed', 1: '❌'}
+    for offset in range(3):
+        day = previous - datetime.timedelta(days=offset)
+        prev_rows += [row(day, 1), row(day, 2, vetoes.get(offset, ''))]
+    prev_rows.append(row(previous - datetime.timedelta(days=20), 1))
+    spreadsheet.add_worksheet(previous.strftime('%B %Y (selects)'), rows_data=prev_rows)
+    # This month: only today's first select so far, plus a repeat of last month's story.
+    spreadsheet.add_worksheet(today.strftime('%B %Y (selects)'), rows_data=[HEADER, row(today, 1), row(previous, 1)])
+    spreadsheet.calls.clear()
+    return spreadsheet
+
+def load(service, today, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return rss_writer.load_articles_from_sheets(today=today, service=service, sheet_id='sheet', **kwargs)
+
+def main():
+    rss_writer.TAB_CACHE_PATH = os.path.join(tempfile.mkdtemp(), 'sheet_tabs.json')
+    today = datetime.date(2026, 10, 1)
+    spreadsheet = build_sheet(today)
+    service = FakeSheetsService(spreadsheet)
+
+    assert rss_writer.month_tabs(today - datetime.timedelta(days=3), today) == [
+        'September 2026 (selects)', 'October 2026 (selects)']
+    assert rss_writer.month_tabs(datetime.date(2026, 12, 30), datetime.date(2027, 1, 2)) == [
+        'December 2026 (selects)', 'January 2027 (selects)']
+
+    # Old behaviour: only the current month's tab is read.
+    current_only = [r for r in spreadsheet.worksheets['October 2026 (selects)'].rows[1:]]
+    print(f"current tab only:  {len(current_only)} row(s) available on {today}")
+
+    vetoed = set()
+    articles = load(service, today, vetoed=vetoed)
+    calls = dict(spreadsheet.calls)
+    print(f"multi-month load:  {len(articles)} article(s) from {calls}")
+    assert len(articles) == 5
+    assert calls == {'spreadsheets.get': 1, 'values.batchGet': 1}
+    assert len({a['link'] for a in articles}) == len(articles)
+    assert len(vetoed) == 2 and not any(a['link'] in vetoed for a in articles)
+
+    # Second call within the TTL reuses the cached tab list: one request total.
+    spreadsheet.calls.clear()
+    rss_writer._tab_cache.clear()
+    load(service, today)
+    print(f"cached metadata:   {dict(spreadsheet.calls)}")
+    assert dict(spreadsheet.calls) == {'values.batchGet': 1}
+
+    # A tab that doesn't exist yet is skipped instead of failing the batch.
+    del spreadsheet.worksheets['October 2026 (selects)']
+    spreadsheet.calls.clear()
+    articles = load(service, today)
+    print(f"missing tab:       {len(articles)} article(s) from {dict(spreadsheet.calls)}")
+    assert len(articles) == 5
+
+    # loadAll covers this month and the previous one in the same single batch.
+    spreadsheet = build_sheet(today)
+    service = FakeSheetsService(spreadsheet)
+    rss_writer._tab_cache.clear()
+    articles = load(service, today, loadAll=True)
+    print(f"loadAll:           {len(articles)} article(s) from {dict(spreadsheet.calls)}")
+    # Eight distinct stories across the two tabs, less the two vetoed ones.
+    assert len(articles) == 6
+    assert spreadsheet.calls['values.batchGet'] == 1
+
+    print("\n✅ Month-boundary loads are complete and take one batchGet")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+# benchmarks/bench_select_caption.py
+#
+# Checks the caption diversity rules in select_caption: a clean candidate
+# beats an overused one, an overused intro falls back softly outside strict
+# mode and is rejected in it, and empty candidates are skipped. Then times
+# selection over a run's worth of candidate sets.
+# Run from the repo root: python benchmarks/bench_select_caption.py
+
+import os
+import sys
+import time
+import random
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from caption_generator import select_caption, caption_intro, MAX_INTRO_USAGE, MAX_TOTAL_PHRASE_USAGE
+
+OVERUSED = "Get ready for the biggest tour of the year! 🎸"
+OVERUSED_TOO = "Get ready for the comeback nobody saw coming 🔥"
+CLEAN = "Paramore are hitting the road again and we're here for it 🎶"
+PHRASED = "New single out now — don't miss it! 🎧"
+
+def usage():
+    used_intros = defaultdict(int, {caption_intro(OVERUSED): MAX_INTRO_USAGE})
+    phrase_position_counts = defaultdict(lambda: defaultdict(int))
+    used_phrases = defaultdict(int, {"don't miss": MAX_TOTAL_PHRASE_USAGE})
+    return used_intros, phrase_position_counts, used_phrases
+
+def check_correctness():
+    # A clean candidate wins over an earlier overused one, in either mode.
+    for strict in (False, True):
+        assert select_caption([OVERUSED, CLEAN], *usage(), strict=strict) == (CLEAN, False)
+
+    # Only overused intros left: soft fallback to the first one, or nothing in strict mode.
+    assert select_caption([OVERUSED, OVERUSED_TOO], *usage()) == (OVERUSED, True)
+    assert select_caption([OVERUSED, OVERUSED_TOO], *usage(), strict=True) == (None, False)
+
+    # Phrase overuse alone only disqualifies in strict mode.
+    assert select_caption([PHRASED], *usage()) == (PHRASED, False)
+    assert select_caption([PHRASED], *usage(), strict=True) == (None, False)
+    assert select_caption([PHRASED, CLEAN], *usage(), strict=True) == (CLEAN, False)
+
+    # Empty candidates are skipped, and surrounding whitespace is dropped.
+    assert select_caption(["", "   ", None, f"  {CLEAN}\n"], *usage()) == (CLEAN, False)
+    assert select_caption(["", None], *usage()) == (None, False)
+    assert select_caption([], *usage(), strict=True) == (None, False)
+
+    # Selection is pure: the usage counters are read, never written.
+    counters = usage()
+    select_caption([OVERUSED, PHRASED, CLEAN], *counters, strict=True)
+    assert dict(counters[0]) == {caption_intro(OVERUSED): MAX_INTRO_USAGE} and not counters[1]
+    assert dict(counters[2]) == {"don't miss": MAX_TOTAL_PHRASE_USAGE}
+    print("Correctness: clean-over-overused, soft fallback, strict rejection and empty skips pass")
+
+def main():
+    check_correctness()
+
+    rng = random.Random(7)
+    pool = [OVERUSED, OVERUSED_TOO, CLEAN, PHRASED, ""]
+    sets = [[rng.choice(pool) for _ in range(3)] for _ in range(10000)]
+    counters = usage()
+    start = time.perf_counter()
+    picked = [select_caption(candidates, *counters) for candidates in sets]
+    elapsed = time.perf_counter() - start
+    soft = sum(1 for _, fallback in picked if fallback)
+    print(f"{len(sets):,} candidate sets in {elapsed * 1000:.1f} ms ({soft:,} soft fallback(s))")
+
+if __name__ == '__main__':
+    main()
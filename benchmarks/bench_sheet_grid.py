@@ -0,0 +1,112 @@
+# benchmarks/bench_sheet_grid.py
+#
+# Checks that every writer widens older tabs before adding columns to them.
+# Monthly tabs used to be created 5 columns wide and selects tabs 6 wide, and
+# the Sheets API rejects writes past a grid's last column (a rejected
+# batchUpdate applies nothing). Also counts the calls each writer makes.
+# Run from the repo root: python benchmarks/bench_sheet_grid.py
+
+import os
+import sys
+import io
+import tempfile
+import contextlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytz
+import sheets_sync
+import article_store
+from article_store import ArticleStore
+from sheets_batch import replace_day_rows, append_rows, _header_requests
+from sheets_sync import MONTHLY_HEADERS, SELECTS_HEADERS
+from fakes import FakeSpreadsheet
+
+PACIFIC = pytz.timezone("America/Los_Angeles")
+LEGACY_MONTHLY = MONTHLY_HEADERS[:5]
+LEGACY_SELECTS = ['Title', 'Link', 'Source', 'Published', 'Caption', 'Image']
+
+def quiet(fn, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+def legacy_monthly():
+    spreadsheet = FakeSpreadsheet()
+    rows = [LEGACY_MONTHLY,
+            ['Old story', 'https://example.com/old', 'Example', 'Mon, 14 Sep 2026 12:00:00 +0000', ''],
+            ['Stale story', 'https://example.com/stale', 'Example', 'Tue, 15 Sep 2026 19:00:00 +0000', '']]
+    worksheet = spreadsheet.add_worksheet('September 2026', cols=5, rows_data=rows)
+    spreadsheet.calls.clear()
+    return spreadsheet, worksheet
+
+NEW_ROW = ['Fresh story', 'https://example.com/fresh', 'Example', 'Tue, 15 Sep 2026 20:00:00 +0000', '',
+           '2026-09-15T20:00:00Z']
+
+def check_monthly():
+    # Without the appendDimension the batch is rejected as a whole.
+    spreadsheet, worksheet = legacy_monthly()
+    requests = _header_requests(worksheet, [LEGACY_MONTHLY], MONTHLY_HEADERS, [NEW_ROW])
+    assert 'appendDimension' in requests[0], requests[0]
+    try:
+        spreadsheet.batch_update({'requests': requests[1:]})
+        raise AssertionError("write past the grid was accepted")
+    except ValueError:
+        pass
+    assert worksheet.rows[0] == LEGACY_MONTHLY and worksheet.col_count == 5
+
+    spreadsheet, worksheet = legacy_monthly()
+    quiet(replace_day_rows, worksheet, MONTHLY_HEADERS, 4, '2026-09-15', PACIFIC, [NEW_ROW], iso_col=6)
+    assert worksheet.col_count == 6 and worksheet.rows[0] == MONTHLY_HEADERS, worksheet.rows[0]
+    assert [r[0] for r in worksheet.rows[1:]] == ['Old story', 'Fresh story'], worksheet.rows
+    assert spreadsheet.calls['spreadsheet_batch_update'] == 1, spreadsheet.calls
+    print(f"replace_day_rows:  5 -> {worksheet.col_count} columns, {dict(spreadsheet.calls)}")
+
+    spreadsheet, worksheet = legacy_monthly()
+    quiet(append_rows, worksheet, MONTHLY_HEADERS, [NEW_ROW])
+    assert worksheet.col_count == 6 and worksheet.rows[-1] == NEW_ROW
+    assert spreadsheet.calls['spreadsheet_batch_update'] == 1, spreadsheet.calls
+    print(f"append_rows:       5 -> {worksheet.col_count} columns, {dict(spreadsheet.calls)}")
+
+    # A tab that is already wide enough gets no extra request.
+    spreadsheet, worksheet = legacy_monthly()
+    worksheet.col_count = 6
+    assert _header_requests(worksheet, [MONTHLY_HEADERS], MONTHLY_HEADERS, [NEW_ROW]) == []
+
+def legacy_selects(title):
+    spreadsheet = FakeSpreadsheet()
+    rows = [LEGACY_SELECTS,
+            ['Old select', 'https://example.com/old', 'Example', 'Mon, 14 Sep 2026 12:00:00 +0000', 'Old caption', '']]
+    worksheet = spreadsheet.add_worksheet(title, cols=6, rows_data=rows)
+    spreadsheet.calls.clear()
+    return spreadsheet, worksheet
+
+def check_push():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ArticleStore(os.path.join(tmp, 'articles.db'))
+        article = {'title': 'New select', 'link': 'https://example.com/new', 'source': 'Example',
+                   'published': 'Mon, 14 Sep 2026 13:00:00 +0000', 'image': ''}
+        store.mark_selected([article], day='2026-09-14')
+        store.set_status([article['link']], article_store.APPROVED)
+
+        spreadsheet, worksheet = legacy_selects('September 2026 (selects)')
+        quiet(sheets_sync.push_selects, store, spreadsheet)
+        assert worksheet.col_count == 8 and worksheet.rows[0] == SELECTS_HEADERS, worksheet.rows[0]
+        assert worksheet.rows[-1][0] == 'New select' and worksheet.rows[-1][6:] == ['✅', '2026-09-14T13:00:00Z']
+        assert spreadsheet.calls['spreadsheet_batch_update'] == 1 and not spreadsheet.calls['batch_update']
+        print(f"push_selects (legacy): 6 -> {worksheet.col_count} columns, {dict(spreadsheet.calls)}")
+
+        # A missing tab is created, headed and filled in the same single batch.
+        spreadsheet = FakeSpreadsheet()
+        quiet(sheets_sync.push_selects, store, spreadsheet)
+        worksheet = spreadsheet.worksheets['September 2026 (selects)']
+        assert worksheet.rows[0] == SELECTS_HEADERS and worksheet.rows[1][0] == 'New select', worksheet.rows
+        print(f"push_selects (new tab): {len(worksheet.rows)} row(s), {dict(spreadsheet.calls)}")
+        store.close()
+
+def main():
+    check_monthly()
+    check_push()
+    print("✅ Older, narrower tabs are widened before their headers grow")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+# benchmarks/bench_sheets_sync.py
+#
+# Checks the store-to-Sheets sync on the selects tab: the tab is read once
+# per run (header plus the Link, Caption and Approval columns, never the
+# whole tab), dashboard edits come into the store, local edits go out as
+# cell updates, a same-day rerun of the selector replaces that day's rows,
+# and every change to a tab lands in one batchUpdate. Then times a sync
+# against a large tab.
+# Run from the repo root: python benchmarks/bench_sheets_sync.py
+
+import os
+import io
+import sys
+import time
+import tempfile
+import datetime
+import contextlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import article_store
+import sheets_sync
+from article_store import ArticleStore
+from sheets_sync import SELECTS_HEADERS
+from fakes import FakeSpreadsheet
+
+DAY = sheets_sync._today()
+TAB = sheets_sync._month_tab(DAY, selects=True)
+# Rows on the tab ran on the 1st of its month, 12:00 UTC (05:00 PST).
+PUBLISHED = datetime.datetime.combine(datetime.date.fromisoformat(DAY).replace(day=1), datetime.time(12),
+                                      datetime.timezone.utc)
+
+def sheet_row(i, caption='', approval=''):
+    return [f"Headline {i}", f"https://example.com/{i}", "Source", PUBLISHED.strftime('%a, %d %b %Y %H:%M:%S +0000'),
+            caption, "", approval, PUBLISHED.strftime('%Y-%m-%dT%H:%M:%SZ')]
+
+def article(i):
+    return dict(zip(['title', 'link', 'source', 'published'], sheet_row(i)))
+
+def sync(store, spreadsheet):
+    # sheets_sync.main() for the selects tab alone, so the counts leave out the monthly tab.
+    spreadsheet.calls.clear()
+    snapshots = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        sheets_sync.pull_selects(store, spreadsheet, snapshots=snapshots)
+        store.mark_synced(sheets_sync.push_selects(store, spreadsheet, snapshots))
+    return dict(spreadsheet.calls)
+
+def links(worksheet):
+    return [row[1] for row in worksheet.rows[1:]]
+
+def check_correctness(tmp):
+    store = ArticleStore(os.path.join(tmp, 'check.db'))
+    # Rows 0 and 1 were picked through the store; row 2 predates it.
+    store.mark_selected([article(0), article(1)], day=DAY)
+    store.mark_synced([article(0)['link'], article(1)['link']])
+    spreadsheet = FakeSpreadsheet()
+    worksheet = spreadsheet.add_worksheet(TAB, rows_data=[SELECTS_HEADERS, sheet_row(0, 'Sheet caption', '❌'),
+                                                          sheet_row(1), sheet_row(2, 'Old caption', '✅')])
+    # A local caption edit that has not been pushed yet.
+    store.set_captions({article(1)['link']: 'Local caption'})
+
+    calls = sync(store, spreadsheet)
+    assert not calls.get('get_all_values') and calls['batch_get'] == 2, calls
+    assert calls['spreadsheet_batch_update'] == 1, calls
+    assert store.get(article(0)['link'])['status'] == article_store.VETOED
+    assert store.get(article(0)['link'])['caption'] == 'Sheet caption'
+    backfilled = store.get(article(2)['link'])
+    assert (backfilled['title'], backfilled['caption'], backfilled['status']) == (
+        'Headline 2', 'Old caption', article_store.APPROVED), backfilled
+    # Dated the morning after it ran (PST), not the day it was pulled.
+    assert backfilled['selected_on'] == backfilled['scraped_on'] == DAY[:8] + '02', backfilled
+    assert worksheet.rows[2][4] == 'Local caption' and worksheet.rows[1][6] == '❌', worksheet.rows
+    print(f"first sync:  {calls}")
+
+    # Nothing changed: one column read and no writes.
+    calls = sync(store, spreadsheet)
+    assert calls == {'worksheet': 1, 'batch_get': 1}, calls
+    print(f"no-op sync:  {calls}")
+
+    # A rerun of the selector replaces the day's plain picks; the vetoed one stays.
+    store.replace_selection([article(3)], DAY)
+    calls = sync(store, spreadsheet)
+    assert links(worksheet) == [article(i)['link'] for i in (0, 2, 3)], links(worksheet)
+    assert calls['spreadsheet_batch_update'] == 1, calls
+    print(f"rerun sync:  {calls}")
+    store.close()
+
+def main():
+    tmp = tempfile.mkdtemp()
+    check_correctness(tmp)
+
+    rows = 5000
+    store = ArticleStore(os.path.join(tmp, 'timing.db'))
+    store.mark_selected([article(i) for i in range(rows)], day=DAY)
+    store.mark_synced(article(i)['link'] for i in range(rows))
+    spreadsheet = FakeSpreadsheet()
+    spreadsheet.add_worksheet(TAB, rows_data=[SELECTS_HEADERS] + [sheet_row(i) for i in range(rows)])
+    store.set_captions({article(i)['link']: f"Caption {i}" for i in range(rows - 5, rows)})
+    start = time.perf_counter()
+    calls = sync(store, spreadsheet)
+    elapsed = time.perf_counter() - start
+    print(f"{rows:,}-row tab, 5 new captions: {elapsed * 1000:.1f} ms, {calls}")
+    store.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+# benchmarks/bench_startup.py
+#
+# Imports each pipeline script in a fresh interpreter with networking
+# disabled, and reports the import time and which heavy client libraries got
+# loaded. Importing a script must not touch the network, and importing
+# rss_scraper_bot has to stay well under a second.
+# Run from the repo root: python benchmarks/bench_startup.py
+
+import os
+import sys
+import json
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = ['rss_scraper_bot', 'gpt_top_article_selector', 'caption_generator', 'rss_writer', 'sheets_sync']
+HEAVY = ['aiohttp', 'requests', 'feedparser', 'gspread', 'oauth2client', 'openai', 'googleapiclient']
+SCRAPER_BUDGET = 1.0
+RUNS = 3
+
+PROBE = r'''
+import json, socket, sys, time
+attempts = []
+def refuse(*args, **kwargs):
+    attempts.append(repr(args[:2]))
+    raise OSError("network disabled during import")
+socket.socket.connect = refuse
+socket.socket.connect_ex = refuse
+socket.getaddrinfo = refuse
+start = time.perf_counter()
+error = None
+try:
+    __import__(sys.argv[1])
+except Exception as e:
+    error = f"{type(e).__name__}: {e}"
+elapsed = time.perf_counter() - start
+heavy = [m for m in json.loads(sys.argv[2]) if m in sys.modules]
+print(json.dumps({"elapsed": elapsed, "network": attempts, "heavy": heavy, "error": error}))
+'''
+
+def probe(module):
+    # Credentials are deliberately absent: building a client at import time
+    # would fail here and show up as an error.
+    env = {k: v for k, v in os.environ.items() if k not in ('CREDS_B64', 'OPENAI_API_KEY')}
+    out = subprocess.run([sys.executable, '-c', PROBE, module, json.dumps(HEAVY)],
+                         cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def main():
+    failures = []
+    print(f"{'module':<26} {'best':>8} {'network':>8}  heavy imports")
+    for module in MODULES:
+        runs = [probe(module) for _ in range(RUNS)]
+        best = min(r['elapsed'] for r in runs)
+        last = runs[-1]
+        print(f"{module:<26} {best * 1000:7.1f}ms {len(last['network']):>8}  {', '.join(last['heavy']) or '-'}")
+        if last['error']:
+            failures.append(f"{module}: import failed ({last['error']})")
+        if last['network']:
+            failures.append(f"{module}: network access at import {last['network']}")
+    scraper = min(probe('rss_scraper_bot')['elapsed'] for _ in range(RUNS))
+    if scraper >= SCRAPER_BUDGET:
+        failures.append(f"rss_scraper_bot: import took {scraper:.2f}s (budget {SCRAPER_BUDGET:.1f}s)")
+
+    if failures:
+        print("\n❌ " + "\n❌ ".join(failures))
+        sys.exit(1)
+    print(f"\n✅ All scripts import without network access; rss_scraper_bot in {scraper * 1000:.0f}ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+# benchmarks/bench_story_clusters.py
+#
+# Checks that cluster_articles folds repeat reports of one story but keeps
+# different stories about the same artist apart, that the newest report
+# represents its cluster, and times the pass on a few thousand headlines.
+# Run from the repo root: python benchmarks/bench_story_clusters.py
+
+import os
+import sys
+import io
+import time
+import random
+import contextlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from story_clusters import cluster_articles
+from stubs import headline
+
+HEADLINES = 3700
+
+# (title, published_utc, image); listed newest first like the scraper's output.
+CASES = [
+    ("Taylor Swift Announces New Album ‘The Life of a Showgirl’", "2026-10-16T10:00:00Z", ""),
+    ("Taylor Swift Performs Surprise Set in London", "2026-10-16T09:00:00Z", "https://img.example/ts-london.jpg"),
+    ("Taylor Swift's Eras Tour Film Heads to Disney+", "2026-10-16T08:00:00Z", ""),
+    ("Billie Eilish Wins Grammy for Song of the Year", "2026-10-16T07:00:00Z", ""),
+    ("Billie Eilish Cancels Show Due to Illness", "2026-10-16T06:00:00Z", "https://img.example/be-ill.jpg"),
+    ("Taylor Swift Announces New Album 'The Life of a Showgirl'", "2026-10-16T05:00:00Z", "https://img.example/ts-album.jpg"),
+    ("Billie Eilish Wins Song of the Year Grammy", "2026-10-16T04:00:00Z", ""),
+    ("Paramore Announce 2027 North American Tour With Special Guests", "2026-10-16T03:00:00Z", ""),
+    ("Paramore Announce North American Tour for 2027", "2026-10-16T02:00:00Z", ""),
+]
+EXPECTED = {
+    "Taylor Swift Announces New Album ‘The Life of a Showgirl’": 2,
+    "Taylor Swift Performs Surprise Set in London": 1,
+    "Taylor Swift's Eras Tour Film Heads to Disney+": 1,
+    "Billie Eilish Wins Grammy for Song of the Year": 2,
+    "Billie Eilish Cancels Show Due to Illness": 1,
+    "Paramore Announce 2027 North American Tour With Special Guests": 2,
+}
+
+def cluster(articles):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return cluster_articles(articles)
+
+def check_correctness():
+    articles = [{'title': t, 'link': f"https://example.com/{i}", 'source': f"Source {i}", 'published_utc': p, 'image': img}
+                for i, (t, p, img) in enumerate(CASES)]
+    stories = cluster(articles)
+    got = {s['title']: 1 + len(s.get('related', [])) for s in stories}
+    assert got == EXPECTED, got
+    # The newest report represents the story and borrows an image from a repeat.
+    album = next(s for s in stories if s['title'].startswith("Taylor Swift Announces"))
+    assert album['image'] == "https://img.example/ts-album.jpg", album
+    print(f"Correctness: {len(CASES)} headlines -> {len(stories)} stories as expected")
+
+def main():
+    check_correctness()
+
+    rng = random.Random(7)
+    articles = [{'title': headline(i % 900, rng), 'link': f"https://example.com/{i}", 'source': 'Example',
+                 'published_utc': f"2026-10-16T{i % 24:02d}:00:00Z", 'image': ''}
+                for i in range(HEADLINES)]
+    start = time.perf_counter()
+    stories = cluster(articles)
+    elapsed = time.perf_counter() - start
+    print(f"{HEADLINES:,} headlines -> {len(stories):,} stories in {elapsed * 1000:.1f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,234 @@
+# benchmarks/fakes.py
+#
+# In-memory stand-ins for the gspread objects and the Sheets v4 service the
+# scripts use, so sheet reads and writes can be exercised and counted offline.
+
+import re
+from collections import Counter
+import gspread
+
+# --- A1 PARSING ---
+_CELL_RE = re.compile(r"^([A-Z]*)(\d*)$")
+
+def _col_index(letters):
+    index = 0
+    for ch in letters:
+        index = index * 26 + (ord(ch) - 64)
+    return index - 1
+
+def _parse_cell(ref):
+    letters, digits = _CELL_RE.match(ref).groups()
+    col = _col_index(letters) if letters else None
+    row = int(digits) - 1 if digits else None
+    return row, col
+
+def parse_a1(a1):
+    a1 = a1.split('!')[-1].strip("'")
+    start, colon, end = a1.partition(':')
+    r0, c0 = _parse_cell(start)
+    if colon:
+        r1, c1 = _parse_cell(end)
+    else:
+        r1, c1 = r0, c0
+    return r0 or 0, c0 or 0, r1, c1
+
+# --- FAKE WORKSHEET ---
+class FakeWorksheet:
+    def __init__(self, spreadsheet, title, sheet_id, rows=None, cols=None):
+        self.spreadsheet = spreadsheet
+        self.title = title
+        self.id = sheet_id
+        self.rows = [list(r) for r in (rows or [])]
+        # Without an explicit width the grid is exactly as wide as the seeded data.
+        self.col_count = int(cols) if cols else max([len(r) for r in self.rows] + [1])
+
+    def _call(self, name):
+        self.spreadsheet.calls[name] += 1
+
+    def _read(self, a1):
+        r0, c0, r1, c1 = parse_a1(a1)
+        r1 = len(self.rows) - 1 if r1 is None else r1
+        out = []
+        for row in self.rows[r0:r1 + 1]:
+            cells = row[c0:] if c1 is None else row[c0:c1 + 1]
+            while cells and cells[-1] == '':
+                cells = cells[:-1]
+            out.append(list(cells))
+        while out and not out[-1]:
+            out.pop()
+        return out
+
+    def _check_width(self, width):
+        # The real API rejects writes past the grid's last column.
+        if width > self.col_count:
+            raise ValueError(f"Range exceeds grid limits. Max columns: {self.col_count} ({self.title})")
+
+    def _write(self, a1, values):
+        r0, c0, _, _ = parse_a1(a1)
+        self._check_width(c0 + max([len(row) for row in values] + [0]))
+        for i, row in enumerate(values):
+            while len(self.rows) <= r0 + i:
+                self.rows.append([])
+            target = self.rows[r0 + i]
+            for j, value in enumerate(row):
+                while len(target) <= c0 + j:
+                    target.append('')
+                target[c0 + j] = '' if value is None else value
+
+    def get_all_values(self):
+        self._call('get_all_values')
+        return self._read('A1:')
+
+    def batch_get(self, ranges):
+        self._call('batch_get')
+        return [self._read(a1) for a1 in ranges]
+
+    def clear(self):
+        self._call('clear')
+        self.rows = []
+
+    def update(self, range_name=None, values=None, **kwargs):
+        self._call('update')
+        # gspread accepts both update(range, values) and update(values, range).
+        if isinstance(range_name, list):
+            range_name, values = values, range_name
+        self._write(range_name or 'A1', values)
+
+    def update_cell(self, row, col, value):
+        self._call('update_cell')
+        from sheets_batch import col_letter
+        self._write(f"{col_letter(col)}{row}", [[value]])
+
+    def append_row(self, values, **kwargs):
+        self._call('append_row')
+        self._check_width(len(values))
+        self.rows.append(list(values))
+
+    def resize(self, rows=None, cols=None):
+        self._call('resize')
+        if cols is not None:
+            self.col_count = int(cols)
+
+    def batch_update(self, data, **kwargs):
+        self._call('batch_update')
+        for item in data:
+            self._check_width(parse_a1(item['range'])[1] + max([len(row) for row in item['values']] + [0]))
+        for item in data:
+            self._write(item['range'], item['values'])
+
+# --- FAKE SPREADSHEET ---
+class FakeSpreadsheet:
+    def __init__(self):
+        self.calls = Counter()
+        self.worksheets = {}
+
+    @property
+    def api_calls(self):
+        return sum(self.calls.values())
+
+    def worksheet(self, title):
+        self.calls['worksheet'] += 1
+        if title not in self.worksheets:
+            raise gspread.exceptions.WorksheetNotFound(title)
+        return self.worksheets[title]
+
+    def add_worksheet(self, title, rows=None, cols=None, rows_data=None):
+        self.calls['add_worksheet'] += 1
+        ws = FakeWorksheet(self, title, len(self.worksheets) + 1, rows_data, cols)
+        self.worksheets[title] = ws
+        return ws
+
+    def batch_update(self, body):
+        self.calls['spreadsheet_batch_update'] += 1
+        sheets = {ws.id: ws for ws in self.worksheets.values()}
+        # batchUpdate is atomic: if any request fails, none of them apply.
+        saved = {ws.id: ([list(r) for r in ws.rows], ws.col_count) for ws in sheets.values()}
+        try:
+            self._apply(sheets, body['requests'])
+        except Exception:
+            for ws in sheets.values():
+                ws.rows, ws.col_count = saved[ws.id]
+            raise
+        return {'replies': []}
+
+    def _apply(self, sheets, requests):
+        for request in requests:
+            if 'appendDimension' in request:
+                req = request['appendDimension']
+                if req['dimension'] == 'COLUMNS':
+                    sheets[req['sheetId']].col_count += req['length']
+            elif 'deleteDimension' in request:
+                rng = request['deleteDimension']['range']
+                ws = sheets[rng['sheetId']]
+                del ws.rows[rng['startIndex']:rng['endIndex']]
+            elif 'appendCells' in request:
+                req = request['appendCells']
+                ws = sheets[req['sheetId']]
+                while ws.rows and not any(ws.rows[-1]):
+                    ws.rows.pop()
+                for row in req['rows']:
+                    ws._check_width(len(row['values']))
+                    ws.rows.append([c['userEnteredValue']['stringValue'] for c in row['values']])
+            elif 'updateCells' in request:
+                req = request['updateCells']
+                ws = sheets[req['start']['sheetId']]
+                r0 = req['start']['rowIndex']
+                values = [[c['userEnteredValue']['stringValue'] for c in row['values']] for row in req['rows']]
+                from sheets_batch import col_letter
+                ws._write(f"{col_letter(req['start']['columnIndex'] + 1)}{r0 + 1}", values)
+            else:
+                raise NotImplementedError(list(request))
+
+# --- FAKE SHEETS V4 SERVICE ---
+class _Request:
+    def __init__(self, fn):
+        self._fn = fn
+
+    def execute(self):
+        return self._fn()
+
+class _FakeValues:
+    def __init__(self, service):
+        self.service = service
+
+    def get(self, spreadsheetId, range):
+        run = lambda: {'range': range, 'values': self.service.read(range)}
+        return _Request(self.service.counted('values.get', run))
+
+    def batchGet(self, spreadsheetId, ranges):
+        # A single missing tab fails the whole batch, like the real API.
+        run = lambda: {'valueRanges': [{'range': r, 'values': self.service.read(r)} for r in ranges]}
+        return _Request(self.service.counted('values.batchGet', run))
+
+class _FakeSpreadsheets:
+    def __init__(self, service):
+        self.service = service
+
+    def get(self, spreadsheetId, fields=None):
+        def run():
+            titles = list(self.service.spreadsheet.worksheets)
+            return {'sheets': [{'properties': {'title': t}} for t in titles]}
+        return _Request(self.service.counted('spreadsheets.get', run))
+
+    def values(self):
+        return _FakeValues(self.service)
+
+class FakeSheetsService:
+    # Mimics googleapiclient's build('sheets', 'v4') over a FakeSpreadsheet.
+    def __init__(self, spreadsheet):
+        self.spreadsheet = spreadsheet
+
+    def counted(self, name, fn):
+        def run():
+            self.spreadsheet.calls[name] += 1
+            return fn()
+        return run
+
+    def read(self, a1):
+        title = a1.split('!')[0].strip("'") if '!' in a1 else next(iter(self.spreadsheet.worksheets))
+        if title not in self.spreadsheet.worksheets:
+            raise ValueError(f"Unable to parse range: {a1}")
+        return self.spreadsheet.worksheets[title]._read(a1)
+
+    def spreadsheets(self):
+        return _FakeSpreadsheets(self)
@@ -0,0 +1,278 @@
+# benchmarks/stubs.py
+#
+# Local stand-ins for the network services the pipeline talks to: a fixture
+# server for feeds and article pages (built from benchmarks/fixtures) and a
+# stub of the OpenAI chat completions endpoint. Both count the requests they
+# serve so benchmarks can report API calls alongside timings.
+#
+# StubProcess runs both servers in a child process (python benchmarks/stubs.py)
+# so their threads don't share the GIL or tracemalloc with the code being
+# measured; it is driven through the /_publish and /_stats endpoints.
+
+import os
+import re
+import sys
+import json
+import time
+import subprocess
+import urllib.request
+import random
+import hashlib
+import datetime
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytz
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# --- SYNTHETIC HEADLINES ---
+_ADJECTIVES = ("Velvet Silver Electric Midnight Golden Neon Paper Broken Crystal Wild Hollow Burning Lunar "
+               "Violet Static Northern Savage Gentle Rusty Cosmic").split()
+_NOUNS = ("Echoes Wolves Satellites Harbors Tigers Lanterns Rivers Ghosts Machines Orchids Mirrors Comets "
+          "Parades Foxes Engines Canyons Saints Rebels Owls Horizons").split()
+_ACTIONS = [
+    "Announce 2027 North American Tour Dates",
+    "Share New Single “{word}”",
+    "Drop Surprise EP “{word}”",
+    "Detail Deluxe Reissue of Debut Album",
+    "Premiere Video for “{word}”",
+    "Add Second Night at {venue}",
+    "Reunite for One-Off Show at {venue}",
+    "Celebrate 10th Anniversary with Special Live Set",
+    "Join Festival Lineup Alongside {other}",
+    "Cover {other} in Session",
+    "Postpone European Dates",
+    "Headline {venue} Next Summer",
+]
+_WORDS = "Daydream Afterglow Heatwave Static Honeymoon Wildfire Overdrive Parallel Undertow Stardust".split()
+_VENUES = ["Red Rocks", "Madison Square Garden", "the Hollywood Bowl", "Brixton Academy", "the Greek Theatre"]
+
+def artist_name(i):
+    return f"{_ADJECTIVES[i % len(_ADJECTIVES)]} {_NOUNS[(i // len(_ADJECTIVES)) % len(_NOUNS)]}"
+
+def headline(i, rng):
+    action = rng.choice(_ACTIONS).format(word=rng.choice(_WORDS), venue=rng.choice(_VENUES),
+                                         other=artist_name(rng.randrange(400)))
+    # The index keeps every headline unique at any scale.
+    return f"{artist_name(i)} {action} (No. {i})"
+
+def yesterday_pst_rfc822(rng):
+    # Midday yesterday in Los Angeles, so is_from_yesterday_pst accepts it.
+    pacific = pytz.timezone("America/Los_Angeles")
+    day = (datetime.datetime.now(pacific) - datetime.timedelta(days=1)).date()
+    moment = pacific.localize(datetime.datetime.combine(day, datetime.time(12, rng.randrange(60), rng.randrange(60))))
+    return moment.astimezone(datetime.timezone.utc).strftime('%a, %d %b %Y %H:%M:%S +0000')
+
+# --- FEED FIXTURES ---
+_ITEM_RE = re.compile(r'<item>.*?</item>', re.S)
+
+def _load_feed_template(name):
+    with open(os.path.join(FIXTURES, name), 'r', encoding='utf-8') as f:
+        text = f.read()
+    items = _ITEM_RE.findall(text)
+    first, last = text.index(items[0]), text.rindex(items[-1]) + len(items[-1])
+    return text[:first], items, text[last:]
+
+def _escape(text):
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+def build_feed(template_name, base_url, start, count, seed=0):
+    # Repeats the recorded items with fresh titles, links and dates; items that
+    # had no media element in the recording still have none, so their images
+    # are resolved from the article pages like in production.
+    head, items, tail = _load_feed_template(template_name)
+    rng = random.Random(seed + start)
+    out = [head]
+    for k in range(count):
+        n = start + k
+        item = items[k % len(items)]
+        link = f"{base_url}/articles/{n}.html"
+        item = re.sub(r'<title>.*?</title>', f'<title>{_escape(headline(n, rng))}</title>', item, flags=re.S)
+        item = re.sub(r'<link>.*?</link>', f'<link>{link}</link>', item, flags=re.S)
+        item = re.sub(r'<guid([^>]*)>.*?</guid>', f'<guid\\1>{link}</guid>', item, flags=re.S)
+        item = re.sub(r'<pubDate>.*?</pubDate>', f'<pubDate>{yesterday_pst_rfc822(rng)}</pubDate>', item, flags=re.S)
+        out.append(item)
+    out.append(tail)
+    return ''.join(out).encode('utf-8')
+
+# --- FIXTURE HTTP SERVER ---
+def _send_json(handler, payload):
+    body = json.dumps(payload).encode('utf-8')
+    handler.send_response(200)
+    handler.send_header('Content-Type', 'application/json')
+    handler.send_header('Content-Length', str(len(body)))
+    handler.end_headers()
+    handler.wfile.write(body)
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def handle(self):
+        try:
+            super().handle()
+        except (BrokenPipeError, ConnectionResetError):
+            # The head-only og:image scanner hangs up once it has what it needs.
+            pass
+
+    def do_GET(self):
+        server = self.server
+        body = None
+        if self.path == '/_stats':
+            return _send_json(self, {'requests': server.requests, 'bytes': server.bytes_sent})
+        if self.path.startswith('/_publish/'):
+            return _send_json(self, server.publish_feeds(int(self.path.rsplit('/', 1)[-1])))
+        if self.path.startswith('/feeds/'):
+            body = server.feeds.get(self.path)
+            content_type = 'application/rss+xml; charset=utf-8'
+        elif self.path.startswith('/articles/'):
+            n = self.path.rsplit('/', 1)[-1].split('.')[0]
+            body = server.article.replace(b'paramore-tour.jpg', f'img-{n}.jpg'.encode())
+            content_type = 'text/html; charset=utf-8'
+        with server.lock:
+            server.requests[self.path.split('/')[1]] += 1
+        if body is None:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        with server.lock:
+            server.bytes_sent += len(body)
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _FixtureHandler)
+        self.base_url = f"http://127.0.0.1:{self.server_address[1]}"
+        self.feeds = {}
+        self.requests = Counter()
+        self.bytes_sent = 0
+        self.lock = threading.Lock()
+        with open(os.path.join(FIXTURES, 'article.html'), 'rb') as f:
+            self.article = f.read()
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    def publish_feeds(self, total_items, feeds=10):
+        # Spreads total_items across `feeds` feeds, alternating the recorded templates.
+        self.feeds = {}
+        per_feed, extra = divmod(total_items, feeds)
+        start = 0
+        urls = []
+        for i in range(feeds):
+            count = per_feed + (1 if i < extra else 0)
+            template = 'feed_wordpress.xml' if i % 2 == 0 else 'feed_news.xml'
+            path = f"/feeds/{i}.xml"
+            self.feeds[path] = build_feed(template, self.base_url, start, count, seed=i)
+            urls.append(self.base_url + path)
+            start += count
+        return urls
+
+    def article_urls(self, count, offset=0):
+        return [f"{self.base_url}/articles/{n}.html" for n in range(offset, offset + count)]
+
+# --- STUB OPENAI SERVER ---
+_INTRO_WORDS = ("Big Huge Fresh Bright Loud Sweet Wild Bold Epic Golden Sunny Electric Dreamy Shiny Rad "
+                "Cosmic Lush Groovy Stellar Vivid").split()
+_INTRO_NOUNS = ("news vibes energy moment drop alert update sounds night day win wave mood spark "
+                "buzz headline scoop story chapter era").split()
+_EMOJI = ["🎶", "🔥", "🎸", "🎤", "✨", "🥁", "🎧", "💫"]
+
+def stub_caption(title, choice):
+    h = int(hashlib.md5(f"{title}|{choice}".encode('utf-8')).hexdigest(), 16)
+    intro = f"{_INTRO_WORDS[h % 20]} {_INTRO_NOUNS[(h // 20) % 20]}"
+    subject = ' '.join(title.split()[:6])
+    return f"{_EMOJI[(h // 400) % len(_EMOJI)]} {intro}: {subject} — turn it up!"
+
+class _OpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        request = json.loads(self.rfile.read(length) or b'{}')
+        prompt = request.get('messages', [{}])[-1].get('content', '')
+        n = request.get('n') or 1
+        match = re.search(r'Return exactly (\d+) headlines', prompt)
+        if match:
+            # Ranking prompt: echo the first N headlines back, one per line.
+            headlines = [line[2:] for line in prompt.splitlines() if line.startswith('- ')]
+            contents = ['\n'.join(headlines[:int(match.group(1))])]
+        else:
+            title = next((line[len('Headline: '):] for line in prompt.splitlines() if line.startswith('Headline: ')), '')
+            contents = [stub_caption(title, i) for i in range(n)]
+        with self.server.lock:
+            self.server.requests['chat.completions'] += 1
+            self.server.tokens += len(prompt.split()) + sum(len(c.split()) for c in contents)
+        _send_json(self, {
+            'id': 'chatcmpl-stub', 'object': 'chat.completion', 'created': 0,
+            'model': request.get('model', 'stub'),
+            'choices': [{'index': i, 'message': {'role': 'assistant', 'content': c}, 'finish_reason': 'stop'}
+                        for i, c in enumerate(contents)],
+            'usage': {'prompt_tokens': len(prompt.split()), 'completion_tokens': sum(len(c.split()) for c in contents),
+                      'total_tokens': len(prompt.split()) + sum(len(c.split()) for c in contents)},
+        })
+
+    def do_GET(self):
+        if self.path == '/v1/_stats':
+            _send_json(self, {'requests': self.server.requests, 'tokens': self.server.tokens})
+
+    def log_message(self, *args):
+        pass
+
+class StubOpenAIServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _OpenAIHandler)
+        self.base_url = f"http://127.0.0.1:{self.server_address[1]}/v1"
+        self.requests = Counter()
+        self.tokens = 0
+        self.lock = threading.Lock()
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+# --- CHILD PROCESS ---
+def _get_json(url):
+    with urllib.request.urlopen(url, timeout=600) as response:
+        return json.load(response)
+
+class StubProcess:
+    # Both servers in a child process; mirrors the counters of the in-process classes.
+    def __init__(self):
+        self.process = subprocess.Popen([sys.executable, os.path.abspath(__file__)],
+                                        stdout=subprocess.PIPE, text=True)
+        urls = json.loads(self.process.stdout.readline())
+        self.base_url = urls['fixtures']
+        self.openai_url = urls['openai']
+
+    def publish_feeds(self, total_items):
+        return _get_json(f"{self.base_url}/_publish/{total_items}")
+
+    def article_urls(self, count, offset=0):
+        return [f"{self.base_url}/articles/{n}.html" for n in range(offset, offset + count)]
+
+    def stats(self):
+        fixtures = _get_json(f"{self.base_url}/_stats")
+        openai = _get_json(f"{self.openai_url}/_stats")
+        calls = Counter({f"http.{k}": v for k, v in fixtures['requests'].items()})
+        calls.update({f"openai.{k}": v for k, v in openai['requests'].items()})
+        return calls
+
+    def close(self):
+        self.process.terminate()
+        self.process.wait()
+
+if __name__ == '__main__':
+    fixtures, openai = FixtureServer(), StubOpenAIServer()
+    print(json.dumps({'fixtures': fixtures.base_url, 'openai': openai.base_url}), flush=True)
+    while True:
+        time.sleep(3600)
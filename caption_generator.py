@@ -1,37 +1,15 @@
-import os
 import json
 import re
-import datetime
+import asyncio
 from collections import defaultdict
-from openai import OpenAI
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
-import base64
-
-# --- SETUP OPENAI ---
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
-# --- HANDLE CREDS FROM ENV ---
-creds_b64 = os.getenv("CREDS_B64")
-if creds_b64:
-    with open("creds.json", "w", encoding="utf-8") as f:
-        decoded = base64.b64decode(creds_b64).decode("utf-8")
-        f.write(decoded)
-else:
-    print("⚠️ CREDS_B64 not found in environment. Google Sheets access may fail.")
-
-# --- GOOGLE SHEETS SETUP ---
-scope = ['https://spreadsheets.google.com/feeds',
-         'https://www.googleapis.com/auth/spreadsheets',
-         'https://www.googleapis.com/auth/drive.file',
-         'https://www.googleapis.com/auth/drive']
-
-creds = ServiceAccountCredentials.from_json_keyfile_name('creds.json', scope)
-gs_client = gspread.authorize(creds)
+import clients
+import instrumentation
+import llm_cache
+from article_store import ArticleStore
+import sheets_sync
 
 INPUT_FILE = 'top_articles.json'
 OUTPUT_FILE = 'top_articles_with_captions.json'
-SHEET_NAME = 'InYourBones Daily Music News'
 
 CAPTION_PROMPT = (
     "Write a short, upbeat social media caption for a music news headline. "
@@ -49,6 +27,10 @@ MAX_POSITION_PHRASE_USAGE = 2
 MAX_INTRO_USAGE = 2
 MAX_ATTEMPTS = 5
 STRICT_MODE = False
+CAPTION_MODEL = "gpt-3.5-turbo"
+CAPTION_CONCURRENCY = 5
+CAPTION_CANDIDATES = 3
+FALLBACK_CAPTION = "🎶 New headline in music — check it out!"
 
 # --- LOAD ARTICLES ---
 def load_articles():
@@ -67,34 +49,38 @@ def analyze_phrase_positions(text):
             results.append((phrase, position))
     return results
 
-# --- PHRASE USAGE CHECK ---
-def phrase_usage_exceeded(text):
-    phrase_positions = analyze_phrase_positions(text)
-    for phrase, pos in phrase_positions:
-        if PHRASE_POSITION_COUNTS[phrase][pos] >= MAX_POSITION_PHRASE_USAGE:
-            print(f"❌ Phrase '{phrase}' overused in position '{pos}'")
-            if STRICT_MODE: return True
-        if USED_PHRASES[phrase] >= MAX_TOTAL_PHRASE_USAGE:
-            print(f"❌ Phrase '{phrase}' overused globally")
-            if STRICT_MODE: return True
-    return False
-
-# --- VALIDATE CAPTION ---
-def validate_caption(caption, soft=False):
-    if not caption.strip():
-        print("❌ Caption is empty")
-        return False
-    phrase_exceeded = phrase_usage_exceeded(caption)
-    intro_key = " ".join(re.findall(r'\w+', caption.lower())[:4])
-    intro_exceeded = USED_INTROS[intro_key] >= MAX_INTRO_USAGE
-
-    if phrase_exceeded or intro_exceeded:
-        if phrase_exceeded:
-            print(f"❌ Phrase limit exceeded in caption")
-        if intro_exceeded:
-            print(f"❌ Intro pattern overused: '{intro_key}'")
-        return not STRICT_MODE and soft
-    return True
+# --- CANDIDATE SELECTION ---
+def caption_intro(caption):
+    return " ".join(re.findall(r'\w+', caption.lower())[:4])
+
+def caption_overuse(caption, used_intros, phrase_position_counts, used_phrases):
+    intro_overused = used_intros.get(caption_intro(caption), 0) >= MAX_INTRO_USAGE
+    phrase_overused = any(
+        phrase_position_counts.get(phrase, {}).get(pos, 0) >= MAX_POSITION_PHRASE_USAGE
+        or used_phrases.get(phrase, 0) >= MAX_TOTAL_PHRASE_USAGE
+        for phrase, pos in analyze_phrase_positions(caption)
+    )
+    return intro_overused, phrase_overused
+
+def select_caption(candidates, used_intros, phrase_position_counts, used_phrases, strict=False):
+    # Pure: returns (caption, soft_fallback) for the best candidate, or (None, False).
+    ranked = []
+    for order, caption in enumerate(candidates):
+        caption = (caption or "").strip()
+        if not caption:
+            continue
+        intro_overused, phrase_overused = caption_overuse(caption, used_intros, phrase_position_counts, used_phrases)
+        ranked.append(((intro_overused, phrase_overused, order), caption))
+    if not ranked:
+        return None, False
+
+    (intro_overused, phrase_overused, _), best = min(ranked)
+    # An overused intro always forces the soft fallback; phrase overuse only counts in strict mode.
+    if not intro_overused and not (strict and phrase_overused):
+        return best, False
+    if not strict:
+        return best, True
+    return None, False
 
 # --- RECORD USAGE ---
 def record_usage(caption):
@@ -103,18 +89,18 @@ def record_usage(caption):
         USED_PHRASES[phrase] += 1
         PHRASE_POSITION_COUNTS[phrase][pos] += 1
         print(f"✅ Tracking phrase '{phrase}' in position '{pos}'")
-    intro_key = " ".join(re.findall(r'\w+', caption.lower())[:4])
+    intro_key = caption_intro(caption)
     USED_INTROS[intro_key] += 1
     print(f"✅ Tracking intro: '{intro_key}'")
 
 # --- GENERATE CAPTION ---
-def generate_caption_for_title(title, force_unique=False):
+def caption_request(title, force_unique=False):
     full_prompt = f"{CAPTION_PROMPT}\n\nHeadline: {title}"
     if force_unique:
         full_prompt += "\nAvoid using any previous structure or phrase pattern."
 
-    response = client.chat.completions.create(
-        model="gpt-3.5-turbo",
+    return dict(
+        model=CAPTION_MODEL,
         messages=[
             {"role": "system", "content": "You are a music-savvy, fun social media editor."},
             {"role": "user", "content": full_prompt}
@@ -123,74 +109,80 @@ def generate_caption_for_title(title, force_unique=False):
         max_tokens=60,
         stream=False
     )
-    return response.choices[0].message.content.strip()
-
-# --- SYNC TO GOOGLE SHEET ---
-def update_sheet_with_captions(final_articles):
-    now = datetime.datetime.now()
-    month_year = now.strftime('%B %Y')
-    sheet_title = f"{month_year} (selects)"
-    print(f"\n🔄 Updating Google Sheet: {sheet_title}")
-
-    try:
-        spreadsheet = gs_client.open(SHEET_NAME)
-        worksheet = spreadsheet.worksheet(sheet_title)
-        data = worksheet.get_all_values()
-
-        headers = data[0]
-        rows = data[1:]
-
-        if 'Caption' not in headers:
-            headers.append('Caption')
-            worksheet.update('A1', [headers])
-
-        caption_col_index = headers.index('Caption')
-
-        updates = []
-        for i, row in enumerate(rows):
-            row_title = row[0].strip()
-            for article in final_articles:
-                if article['title'].strip() == row_title:
-                    while len(row) <= caption_col_index:
-                        row.append("")
-                    row[caption_col_index] = article['caption']
-                    updates.append((i+2, row))
-
-        for row_num, row_data in updates:
-            worksheet.update(f"A{row_num}", [row_data])
-
-        print(f"✅ Updated {len(updates)} rows in '{sheet_title}'")
-    except Exception as e:
-        print(f"❌ Error updating sheet: {e}")
 
-# --- MAIN ---
-def main():
-    articles = load_articles()
-
-    for article in articles:
-        print(f"\n➡️ Generating caption for: {article['title']}")
-        caption = ""
-        fallback_used = False
-        for attempt in range(MAX_ATTEMPTS):
-            caption = generate_caption_for_title(article['title'], force_unique=(attempt >= 2))
-            if validate_caption(caption):
-                print(f"✅ Valid caption: {caption}")
-                record_usage(caption)
-                break
-            elif validate_caption(caption, soft=True):
-                print(f"⚠️ Soft-approved fallback caption: {caption}")
-                record_usage(caption)
-                fallback_used = True
-                break
+def generate_caption_for_title(title, force_unique=False):
+    return llm_cache.cached_completion(clients.openai_client(), **caption_request(title, force_unique))[0]
+
+async def generate_candidates_async(async_client, semaphore, title, force_unique=False, n=CAPTION_CANDIDATES, attempt=0):
+    async with semaphore:
+        try:
+            return await llm_cache.cached_completion_async(
+                async_client, variant=attempt, **caption_request(title, force_unique), n=n
+            )
+        except Exception as e:
+            print(f"❌ Caption request failed for '{title}': {e}")
+            return []
+
+# --- ACCEPT CAPTION ---
+def accept_candidates(candidates):
+    caption, fallback = select_caption(candidates, USED_INTROS, PHRASE_POSITION_COUNTS, USED_PHRASES, STRICT_MODE)
+    if caption is None:
+        print(f"❌ No usable caption among {len(candidates)} candidate(s)")
+        return None, False
+    if fallback:
+        print(f"⚠️ Soft-approved fallback caption: {caption}")
+    else:
+        print(f"✅ Valid caption: {caption}")
+    record_usage(caption)
+    return caption, fallback
+
+# --- CONCURRENT CAPTIONING ---
+async def generate_captions(articles, concurrency=CAPTION_CONCURRENCY):
+    captions = [""] * len(articles)
+    fallback_used = [False] * len(articles)
+    pending = list(range(len(articles)))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async_client = clients.async_openai_client()
+    for attempt in range(MAX_ATTEMPTS):
+        if not pending:
+            break
+        print(f"\n🚀 Requesting {len(pending)} caption(s) concurrently (attempt {attempt+1})")
+        results = await asyncio.gather(*[
+            generate_candidates_async(async_client, semaphore, articles[i]['title'],
+                                      force_unique=(attempt >= 2), attempt=attempt)
+            for i in pending
+        ])
+
+        # Apply the diversity rules in article order so usage limits stay deterministic.
+        rejected = []
+        for i, candidates in zip(pending, results):
+            print(f"\n➡️ Caption for: {articles[i]['title']}")
+            caption, fallback_used[i] = accept_candidates(candidates)
+            if caption is None:
+                captions[i] = next((c for c in candidates if c), captions[i])
+                print(f"🔁 Retry attempt {attempt+1} for: {articles[i]['title']}")
+                rejected.append(i)
             else:
-                print(f"🔁 Retry attempt {attempt+1} for: {article['title']}")
+                captions[i] = caption
+        pending = rejected
 
-        if not caption.strip():
-            caption = "🎶 New headline in music — check it out!"
+    for i, article in enumerate(articles):
+        if not captions[i].strip():
+            captions[i] = FALLBACK_CAPTION
             print(f"⚠️ Full fallback used for: {article['title']}")
-        elif fallback_used:
-            print(f"⚠️ Final fallback-approved caption accepted: {caption}")
+        elif fallback_used[i]:
+            print(f"⚠️ Final fallback-approved caption accepted: {captions[i]}")
+    return captions
+
+# --- MAIN ---
+def main(articles=None):
+    if articles is None:
+        articles = load_articles()
 
+    with instrumentation.span('generate_captions'):
+        captions = asyncio.run(generate_captions(articles))
+    for article, caption in zip(articles, captions):
         article['caption'] = caption
 
     with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
@@ -198,7 +190,13 @@ def main():
 
     print(f"\n✅ Saved {len(articles)} articles with captions to '{OUTPUT_FILE}'")
 
-    update_sheet_with_captions(articles)
+    # sheets_sync pushes the changed caption cells to the selects tab.
+    with instrumentation.span('store_captions'):
+        ArticleStore().set_captions({a['link']: a['caption'] for a in articles if a.get('link')})
+    llm_cache.report()
+    return articles
 
 if __name__ == '__main__':
     main()
+    sheets_sync.main()
+    instrumentation.write_report()
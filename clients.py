@@ -0,0 +1,75 @@
+import os
+import json
+import base64
+import functools
+import instrumentation
+
+# --- CONFIG ---
+GOOGLE_SHEET_NAME = 'InYourBones Daily Music News'
+CREDS_FILE = 'creds.json'
+SCOPE = ['https://spreadsheets.google.com/feeds',
+         'https://www.googleapis.com/auth/spreadsheets',
+         'https://www.googleapis.com/auth/drive.file',
+         'https://www.googleapis.com/auth/drive']
+
+# --- INSTRUMENTATION ---
+def _count_sheets_call(*args, **kwargs):
+    instrumentation.count('sheets.calls')
+
+# --- SHARED CLIENTS ---
+# Each accessor builds its client once per process, so stages that run in the
+# same process (see run_pipeline.py) share one authorized session.
+@functools.lru_cache(maxsize=None)
+def service_account_info():
+    creds_b64 = os.getenv("CREDS_B64")
+    if creds_b64:
+        return json.loads(base64.b64decode(creds_b64).decode("utf-8"))
+    if os.path.exists(CREDS_FILE):
+        with open(CREDS_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    raise RuntimeError("Missing CREDS_B64 env var and no creds.json on disk")
+
+@functools.lru_cache(maxsize=None)
+def gspread_client():
+    import gspread
+    from oauth2client.service_account import ServiceAccountCredentials
+    creds = ServiceAccountCredentials.from_json_keyfile_dict(service_account_info(), SCOPE)
+    client = gspread.authorize(creds)
+    if instrumentation.ENABLED:
+        # Every gspread call is one request on this session.
+        client.http_client.session.hooks['response'].append(_count_sheets_call)
+    return client
+
+@functools.lru_cache(maxsize=None)
+def spreadsheet(name=GOOGLE_SHEET_NAME):
+    sheet = gspread_client().open(name)
+    print("✅ Google Sheets connected.")
+    return sheet
+
+@functools.lru_cache(maxsize=None)
+def sheets_service():
+    from google.oauth2 import service_account
+    from googleapiclient.discovery import build
+    from googleapiclient.http import HttpRequest
+    creds = service_account.Credentials.from_service_account_info(service_account_info())
+    if not instrumentation.ENABLED:
+        return build('sheets', 'v4', credentials=creds, cache_discovery=False)
+
+    class CountingHttpRequest(HttpRequest):
+        def execute(self, *args, **kwargs):
+            _count_sheets_call()
+            return super().execute(*args, **kwargs)
+
+    return build('sheets', 'v4', credentials=creds, cache_discovery=False, requestBuilder=CountingHttpRequest)
+
+@functools.lru_cache(maxsize=None)
+def openai_client():
+    from openai import OpenAI
+    return OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+@functools.lru_cache(maxsize=None)
+def async_openai_client():
+    # Its connection pool belongs to the event loop that first uses it, so
+    # captioning runs it inside one asyncio.run per process.
+    from openai import AsyncOpenAI
+    return AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
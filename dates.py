@@ -0,0 +1,60 @@
+import re
+import time
+import datetime
+import functools
+from email.utils import parsedate_to_datetime
+
+# --- CONFIG ---
+ISO_UTC_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+PARSE_CACHE_SIZE = 65536
+# parsedate is lenient (it ignores e.g. a trailing 'PM'), so only hand it strict RFC 822 shapes.
+RFC822_RE = re.compile(r'^(?:[A-Za-z]{3},\s*)?\d{1,2}\s+[A-Za-z]{3}\s+\d{2,4}\s+\d{1,2}:\d{2}(?::\d{2})?\s+(?:[+-]\d{4}|[A-Za-z]{1,5})$')
+
+# --- PARSING ---
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_date(value):
+    # Feed dates are almost always RFC 822 ("Mon, 12 Oct 2026 10:00:00 +0000")
+    # or ISO 8601; both have exact stdlib parsers. dateutil's fuzzy parser is
+    # only the fallback. Raises ValueError like dateutil does.
+    value = (value or '').strip()
+    if not value:
+        raise ValueError("empty date string")
+    if value[:4].isdigit() and value[4:5] == '-':
+        try:
+            return datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            pass
+    elif RFC822_RE.match(value):
+        try:
+            return parsedate_to_datetime(value)
+        except (TypeError, ValueError, IndexError):
+            pass
+    from dateutil import parser
+    return parser.parse(value)
+
+def iso_utc(value):
+    # Normalized sort key written next to the free-form date: ISO 8601 in UTC,
+    # so later stages can filter and order rows with plain string comparison.
+    # Naive times are taken as UTC. Returns '' for unparseable input.
+    try:
+        parsed = value if isinstance(value, datetime.datetime) else parse_date(value)
+    except (ValueError, OverflowError):
+        return ''
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(datetime.timezone.utc)
+    return parsed.strftime(ISO_UTC_FORMAT)
+
+def iso_utc_from_struct(parsed):
+    # feedparser's *_parsed fields are already normalized to UTC.
+    return time.strftime(ISO_UTC_FORMAT, tuple(parsed)[:9]) if parsed else ''
+
+def parse_iso_utc(value):
+    return datetime.datetime.strptime(value, ISO_UTC_FORMAT).replace(tzinfo=datetime.timezone.utc)
+
+def utc_bounds(date_str, tz):
+    # [start, end) of a local calendar day as ISO UTC strings.
+    day = datetime.datetime.strptime(date_str, '%Y-%m-%d')
+    next_day = day + datetime.timedelta(days=1)
+    if hasattr(tz, 'localize'):
+        return iso_utc(tz.localize(day)), iso_utc(tz.localize(next_day))
+    return iso_utc(day.replace(tzinfo=tz)), iso_utc(next_day.replace(tzinfo=tz))
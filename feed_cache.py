@@ -0,0 +1,98 @@
+import os
+import json
+import time
+import hashlib
+import tempfile
+
+# --- CONFIG ---
+CACHE_DIR = os.getenv("CACHE_DIR", ".cache")
+FEED_CACHE_DIR = os.path.join(CACHE_DIR, "feeds")
+
+ENTRY_FIELDS = [
+    'id', 'title', 'link', 'links', 'published', 'published_parsed',
+    'updated', 'updated_parsed', 'media_content', 'media_thumbnail',
+]
+
+# --- SNAPSHOT HELPERS ---
+def _snapshot_entry(entry):
+    snapshot = {}
+    for key in ENTRY_FIELDS:
+        if key in entry:
+            value = entry[key]
+            if isinstance(value, time.struct_time):
+                value = list(value)
+            snapshot[key] = value
+    return snapshot
+
+def _restore_entry(snapshot):
+    from feedparser import FeedParserDict
+    entry = FeedParserDict()
+    for key, value in snapshot.items():
+        if key.endswith('_parsed') and value is not None:
+            value = time.struct_time(value)
+        elif key == 'links':
+            value = [FeedParserDict(link) for link in value]
+        entry[key] = value
+    return entry
+
+# --- FEED CACHE ---
+class FeedCache:
+    def __init__(self, directory=FEED_CACHE_DIR):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self.bytes_downloaded = 0
+        self.bytes_saved = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, url):
+        return os.path.join(self.directory, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.json')
+
+    def _read(self, url):
+        try:
+            with open(self._path(url), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def conditional_headers(self, url):
+        record = self._read(url)
+        headers = {}
+        if record:
+            if record.get('etag'):
+                headers['If-None-Match'] = record['etag']
+            if record.get('last_modified'):
+                headers['If-Modified-Since'] = record['last_modified']
+        return headers
+
+    def load(self, url):
+        record = self._read(url)
+        if record is None:
+            return None
+        self.hits += 1
+        self.bytes_saved += record.get('bytes', 0)
+        from feedparser import FeedParserDict
+        feed = FeedParserDict()
+        feed['feed'] = FeedParserDict(title=record.get('feed_title', ''))
+        feed['entries'] = [_restore_entry(e) for e in record.get('entries', [])]
+        return feed
+
+    def store(self, url, feed, etag=None, last_modified=None, size=0):
+        self.misses += 1
+        self.bytes_downloaded += size
+        record = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'bytes': size,
+            'feed_title': feed.feed.get('title', ''),
+            'entries': [_snapshot_entry(e) for e in feed.entries],
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(record, f)
+        os.replace(tmp_path, self._path(url))
+
+    def report(self):
+        print(f"📦 Feed cache: {self.hits} hit(s) / {self.misses} miss(es), "
+              f"{self.bytes_saved:,} bytes saved, {self.bytes_downloaded:,} bytes downloaded")
@@ -0,0 +1,81 @@
+import asyncio
+import time
+from urllib.parse import urlparse
+import instrumentation
+from http_client import DEFAULT_HEADERS, HTTP_ERROR_RETRIES, HTTP_POOL_SIZE, HTTP_RETRIES, RETRY_STATUSES, backoff_delay, rate_limiter
+
+# --- CONFIG ---
+FEED_CONCURRENCY = 5
+FEED_TIMEOUT = 15
+FEED_HOST_TIMEOUTS = {
+    'www.billboard.com': 25,
+    'www.rollingstone.com': 25,
+}
+
+# --- HELPERS ---
+def _timeout_for(url, host_timeouts):
+    host = urlparse(url).hostname or ''
+    return host_timeouts.get(host, FEED_TIMEOUT)
+
+async def _fetch_one(session, semaphore, url, host_timeouts, headers, retries):
+    import aiohttp
+    result = {'url': url, 'status': None, 'body': b'', 'etag': None, 'last_modified': None,
+              'elapsed': 0.0, 'error': None, 'attempts': 0}
+    async with semaphore:
+        start = time.perf_counter()
+        timeout = aiohttp.ClientTimeout(total=_timeout_for(url, host_timeouts))
+        for attempt in range(retries + 1):
+            await asyncio.sleep(rate_limiter.reserve(url))
+            result['attempts'] = attempt + 1
+            retry_after = None
+            try:
+                async with session.get(url, timeout=timeout, headers=headers) as response:
+                    result['status'] = response.status
+                    result['etag'] = response.headers.get('ETag')
+                    result['last_modified'] = response.headers.get('Last-Modified')
+                    result['error'] = None
+                    if response.status in RETRY_STATUSES:
+                        retry_after = response.headers.get('Retry-After')
+                    elif response.status != 304:
+                        result['body'] = await response.read()
+            except Exception as e:
+                result['error'] = e
+            if result['error'] is None and result['status'] not in RETRY_STATUSES:
+                break
+            if result['error'] is not None and attempt >= HTTP_ERROR_RETRIES:
+                break
+            if attempt < retries:
+                await asyncio.sleep(backoff_delay(attempt, retry_after))
+        result['elapsed'] = time.perf_counter() - start
+    return result
+
+async def _fetch_all(urls, concurrency, host_timeouts, cache, retries):
+    import aiohttp
+    semaphore = asyncio.Semaphore(concurrency)
+    # Keep-alive pool shared by every feed; repeat hosts reuse their sockets.
+    connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=HTTP_POOL_SIZE)
+    async with aiohttp.ClientSession(connector=connector, headers=DEFAULT_HEADERS) as session:
+        tasks = [
+            _fetch_one(session, semaphore, url, host_timeouts,
+                       cache.conditional_headers(url) if cache else {}, retries)
+            for url in urls
+        ]
+        return await asyncio.gather(*tasks)
+
+# --- MAIN FETCH ---
+def fetch_feeds(urls, concurrency=FEED_CONCURRENCY, host_timeouts=None, cache=None, retries=HTTP_RETRIES):
+    host_timeouts = FEED_HOST_TIMEOUTS if host_timeouts is None else host_timeouts
+    start = time.perf_counter()
+    results = asyncio.run(_fetch_all(urls, concurrency, host_timeouts, cache, retries))
+
+    for r in results:
+        instrumentation.count('http.requests')
+        instrumentation.count('http.retries', r['attempts'] - 1)
+        instrumentation.count('http.bytes', len(r['body']))
+        if r['error'] is not None:
+            print(f"⚠️ {r['url']} failed after {r['elapsed']:.2f}s: {r['error']}")
+        else:
+            retried = f" after {r['attempts']} attempts" if r['attempts'] > 1 else ""
+            print(f"⏱️ {r['url']} — HTTP {r['status']}, {len(r['body'])} bytes in {r['elapsed']:.2f}s{retried}")
+    print(f"⏱️ Fetched {len(results)} feeds in {time.perf_counter() - start:.2f}s (concurrency={concurrency})")
+    return results
@@ -0,0 +1,70 @@
+import os
+import json
+import time
+import calendar
+import tempfile
+from sqlite_cache import CACHE_DIR
+
+# --- CONFIG ---
+HWM_PATH = os.path.join(CACHE_DIR, "feed_hwm.json")
+CATCHUP_HOURS = int(os.getenv("SCRAPE_CATCHUP_HOURS", "48"))
+MAX_CATCHUP_HOURS = int(os.getenv("SCRAPE_MAX_CATCHUP_HOURS", "168"))
+LATE_GRACE_HOURS = 6
+
+# --- HELPERS ---
+def entry_key(entry):
+    return entry.get('id') or entry.get('guid') or entry.get('link')
+
+def entry_timestamp(entry):
+    parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+    return calendar.timegm(tuple(parsed)[:9]) if parsed else None
+
+# --- HIGH-WATER MARKS ---
+class HighWaterMarks:
+    def __init__(self, path=HWM_PATH, catchup_hours=CATCHUP_HOURS, max_catchup_hours=MAX_CATCHUP_HOURS):
+        self.path = path
+        self.catchup = catchup_hours * 3600
+        self.max_catchup = max_catchup_hours * 3600
+        self.now = time.time()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.marks = json.load(f)
+        except (OSError, ValueError):
+            self.marks = {}
+
+    def floor(self, url):
+        mark = self.marks.get(url)
+        oldest = self.now - self.max_catchup
+        if not mark:
+            return max(self.now - self.catchup, oldest)
+        # Re-check a short window below the mark for late-published entries,
+        # but never reach further back than the maximum catch-up window.
+        return max(mark['published'] - LATE_GRACE_HOURS * 3600, oldest)
+
+    def is_new(self, url, entry):
+        ts = entry_timestamp(entry)
+        if ts is None or ts < self.floor(url):
+            return False
+        mark = self.marks.get(url)
+        return not mark or entry_key(entry) not in mark['seen']
+
+    def advance(self, url, entries):
+        mark = self.marks.get(url) or {'published': 0, 'seen': {}}
+        seen = dict(mark['seen'])
+        newest = mark['published']
+        for entry in entries:
+            ts, key = entry_timestamp(entry), entry_key(entry)
+            if ts is not None and key:
+                seen[key] = ts
+                newest = max(newest, ts)
+        # Ids older than the grace window sit below the floor, so they can be dropped.
+        cutoff = newest - LATE_GRACE_HOURS * 3600
+        self.marks[url] = {'published': newest, 'seen': {k: t for k, t in seen.items() if t >= cutoff}}
+
+    def save(self):
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(self.marks, f, indent=2)
+        os.replace(tmp_path, self.path)
@@ -1,47 +1,88 @@
-import os
 import json
 import datetime
-import gspread
-from dateutil import parser
-from openai import OpenAI
-from oauth2client.service_account import ServiceAccountCredentials
 import pytz
-import base64
+import clients
+import instrumentation
+from dates import iso_utc, utc_bounds
+import llm_cache
+from title_index import TitleSimilarityIndex
+import pre_ranker
+from article_store import ArticleStore
+import sheets_sync
 
 GOOGLE_SHEET_NAME = 'InYourBones Daily Music News'
-
-# --- SETUP OPENAI ---
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
-# --- HANDLE CREDS FROM ENV ---
-creds_b64 = os.getenv("CREDS_B64")
-if creds_b64:
-    with open("creds.json", "w", encoding="utf-8") as f:
-        decoded = base64.b64decode(creds_b64).decode("utf-8")
-        f.write(decoded)
-else:
-    print("⚠️ CREDS_B64 not found in environment. Google Sheets access may fail.")
-
-# --- GOOGLE SHEETS SETUP ---
-scope = ['https://spreadsheets.google.com/feeds',
-         'https://www.googleapis.com/auth/spreadsheets',
-         'https://www.googleapis.com/auth/drive.file',
-         'https://www.googleapis.com/auth/drive']
-
-creds = ServiceAccountCredentials.from_json_keyfile_name('creds.json', scope)
-gsheet = gspread.authorize(creds)
-print("✅ Google Sheets connected.")
-spreadsheet = gsheet.open(GOOGLE_SHEET_NAME)
+MAX_HEADLINES_FOR_RANKING = 60
+TRAINING_MONTHS = 2
 
 # --- LOAD ARTICLES FROM JSON ---
 def load_articles(filepath='latest_articles.json'):
     with open(filepath, 'r', encoding='utf-8') as f:
         return json.load(f)
 
+# --- PRE-RANKER TRAINING DATA ---
+def _from_current_run(row, iso_col, cutoff):
+    iso = row[iso_col].strip() if iso_col is not None and len(row) > iso_col else ''
+    if not iso and len(row) > 3:
+        iso = iso_utc(row[3])
+    return bool(iso) and iso >= cutoff
+
+def load_ranking_examples(months=TRAINING_MONTHS, store=None):
+    # Today's candidates were just scraped into the store and the monthly tab;
+    # training on them as negatives would mark down the headlines about to be
+    # ranked, so the current run's rows are left out.
+    pacific = pytz.timezone("America/Los_Angeles")
+    now = datetime.datetime.now(pacific)
+    month = now.replace(day=1)
+    if store is not None:
+        since = month.date()
+        for _ in range(months - 1):
+            since = (since - datetime.timedelta(days=1)).replace(day=1)
+        examples = store.labelled_titles(since.isoformat(), exclude_day=now.date().isoformat())
+        # The scrape stage has just filled the store with today's rows, which are
+        # excluded; until it holds selects from earlier runs, use the Sheets history.
+        if any(label for _, label in examples):
+            return examples
+    # On the Sheets path the run's rows are the ones published on the scrape
+    # day (yesterday, PST) or later.
+    cutoff, _ = utc_bounds((now - datetime.timedelta(days=1)).strftime('%Y-%m-%d'), pacific)
+    import gspread
+    spreadsheet = clients.spreadsheet(GOOGLE_SHEET_NAME)
+    examples = []
+    for _ in range(months):
+        selected = set()
+        try:
+            rows = spreadsheet.worksheet(month.strftime('%B %Y (selects)')).get_all_values()
+            headers = rows[0] if rows else []
+            approval_col = headers.index('Approval') if 'Approval' in headers else None
+            iso_col = headers.index('Published UTC') if 'Published UTC' in headers else None
+            for row in rows[1:]:
+                if not row or not row[0].strip() or _from_current_run(row, iso_col, cutoff):
+                    continue
+                approval = row[approval_col].strip() if approval_col is not None and len(row) > approval_col else ''
+                examples.append((row[0].strip(), 0 if approval in sheets_sync.VETO_MARKS else 1))
+                selected.add(row[0].strip())
+        except gspread.exceptions.WorksheetNotFound:
+            pass
+        try:
+            # Scraped-but-not-selected headlines are weak negatives.
+            rows = spreadsheet.worksheet(month.strftime('%B %Y')).get_all_values()
+            headers = rows[0] if rows else []
+            iso_col = headers.index('Published UTC') if 'Published UTC' in headers else None
+            for row in rows[1:]:
+                if row and row[0].strip() and row[0].strip() not in selected and not _from_current_run(row, iso_col, cutoff):
+                    examples.append((row[0].strip(), 0))
+        except gspread.exceptions.WorksheetNotFound:
+            pass
+        month = (month - datetime.timedelta(days=1)).replace(day=1)
+    return examples
+
 # --- RANK WITH GPT ---
-def rank_top_articles(articles, count=5):
-    MAX_HEADLINES_FOR_RANKING = 60
-    input_articles = articles[:MAX_HEADLINES_FOR_RANKING]
+@instrumentation.timed()
+def rank_top_articles(articles, count=5, ranker=None):
+    # Score every article locally and only send the best candidates to GPT.
+    ranker = ranker or pre_ranker.PreRanker()
+    with instrumentation.span('pre_rank'):
+        input_articles = ranker.top_k(articles, MAX_HEADLINES_FOR_RANKING)
     headlines = [f"- {a['title']}" for a in input_articles]
 
     prompt = f"""
@@ -56,43 +97,38 @@ Make sure to select a variety of artists — do not include multiple headlines a
 Return exactly {count} headlines, each on a new line, using the original wording.
 """
 
-    response = client.chat.completions.create(
+    content = llm_cache.cached_completion(
+        clients.openai_client(),
         model="gpt-3.5-turbo",
         messages=[
             {"role": "system", "content": "You are a helpful assistant."},
             {"role": "user", "content": prompt}
         ],
         temperature=0.7
-    )
-
-    content = response.choices[0].message.content.strip()
+    )[0]
     selected_titles = [t.lstrip("- ").strip() for t in content.splitlines() if t.strip()]
 
+    index = TitleSimilarityIndex(a['title'] for a in articles)
     seen_titles = set()
-    seen_keywords = set()
     top_articles = []
     for t in selected_titles:
-        for a in articles:
-            if a['title'] == t and t not in seen_titles:
-                keywords = set(a['title'].lower().split())
-                if all(len(keywords & set(k.lower().split())) < 3 for k in seen_keywords):
-                    top_articles.append(a)
-                    seen_titles.add(t)
-                    seen_keywords.add(a['title'])
-                    break
+        i = index.index_of(t)
+        if i is not None and t not in seen_titles and not index.is_too_similar(i):
+            top_articles.append(articles[i])
+            seen_titles.add(t)
+            index.choose(i)
 
     print(f"🧠 GPT selected {len(top_articles)} unique articles.")
 
     if len(top_articles) < count:
-        fallback_pool = [a for a in articles if a['title'] not in seen_titles]
-        for candidate in fallback_pool:
-            candidate_keywords = set(candidate['title'].lower().split())
-            if all(len(candidate_keywords & set(k.lower().split())) < 3 for k in seen_keywords):
-                top_articles.append(candidate)
-                seen_titles.add(candidate['title'])
-                seen_keywords.add(candidate['title'])
-                if len(top_articles) >= count:
-                    break
+        for i, candidate in enumerate(articles):
+            if candidate['title'] in seen_titles or index.is_too_similar(i):
+                continue
+            top_articles.append(candidate)
+            seen_titles.add(candidate['title'])
+            index.choose(i)
+            if len(top_articles) >= count:
+                break
 
     return top_articles[:count]
 
@@ -101,90 +137,41 @@ def save_top_articles(articles, filepath='top_articles.json'):
     with open(filepath, 'w', encoding='utf-8') as f:
         json.dump(articles, f, indent=2)
 
-# --- WRITE TO MONTHLY SELECTS SHEET ---
-def update_selects_sheet(articles):
-    pacific = pytz.timezone("America/Los_Angeles")
-    now = datetime.datetime.now(pacific)
-    month_tab = now.strftime('%B %Y (selects)')
-    today_str = now.strftime('%Y-%m-%d')
-
-    try:
-        worksheet = spreadsheet.worksheet(month_tab)
-        print(f"📝 Writing to sheet tab: {month_tab}")
-    except gspread.exceptions.WorksheetNotFound:
-        worksheet = spreadsheet.add_worksheet(title=month_tab, rows="1000", cols="6")
-        worksheet.append_row(['Title', 'Link', 'Source', 'Published', 'Caption', 'Image'])
-        print(f"➕ Created new sheet tab: {month_tab}")
-
-    all_values = worksheet.get_all_values()
-    headers = all_values[0] if all_values else ['Title', 'Link', 'Source', 'Published', 'Caption', 'Image']
-    while len(headers) < 6:
-        headers.append('')
-
-    # Create set of (title, link) to detect duplicates
-    existing_keys = set()
-    for row in all_values[1:]:
-        if len(row) >= 2:
-            key = (row[0].strip(), row[1].strip())
-            existing_keys.add(key)
-
-    # Filter out today's rows
-    filtered_values = []
-    removed_count = 0
-    for row in all_values[1:]:
-        if len(row) >= 4:
-            try:
-                parsed_date = parser.parse(row[3]).astimezone(pacific).date()
-                if parsed_date.strftime('%Y-%m-%d') != today_str:
-                    while len(row) < len(headers):
-                        row.append('')
-                    filtered_values.append(row)
-                else:
-                    removed_count += 1
-            except Exception as e:
-                print(f"⚠️ Error parsing date '{row[3]}': {e}")
-                while len(row) < len(headers):
-                    row.append('')
-                filtered_values.append(row)
-    print(f"🗑️ Removed {removed_count} rows from today")
-
-    # Add new rows
-    new_rows = []
-    for a in articles:
-        key = (a['title'].strip(), a['link'].strip())
-        if key in existing_keys:
-            print(f"⏭️ Skipping duplicate: {a['title']}")
-            continue
-
-        caption = f"{a['title'].split(':')[0]} – more to come..."  # Placeholder
-        row = [
-            a['title'],
-            a['link'],
-            a['source'],
-            a['published'],
-            caption,
-            a.get('image', '')
-        ]
-        print(f"✅ Adding row: {row[0][:40]}... | Image: {row[5]}")
-        new_rows.append(row)
-
-    final_data = [headers] + filtered_values + new_rows
-    worksheet.clear()
-    worksheet.update(values=final_data, range_name='A1')
-    print(f"✅ Sheet updated with {len(new_rows)} new row(s).")
+# --- RECORD SELECTS ---
+@instrumentation.timed()
+def record_selects(articles, store=None):
+    # The store is the system of record; sheets_sync pushes the picks to the
+    # selects tab. A rerun on the same day replaces that day's picks.
+    store = store or ArticleStore()
+    day = datetime.datetime.now(pytz.timezone("America/Los_Angeles")).date().isoformat()
+    store.replace_selection(articles, day)
+    print(f"✅ Recorded {len(articles)} select(s) for {day}")
 
 # --- MAIN ---
-if __name__ == '__main__':
-    print("🔄 Loading latest articles...")
-    all_articles = load_articles()
+def main(all_articles=None):
+    if all_articles is None:
+        print("🔄 Loading latest articles...")
+        all_articles = load_articles()
+
+    print("⚖️ Training local pre-ranker...")
+    store = ArticleStore()
+    with instrumentation.span('train_pre_ranker'):
+        ranker = pre_ranker.train(load_ranking_examples(store=store))
 
     print("🧠 Selecting top 5 with GPT...")
-    top_five = rank_top_articles(all_articles, count=5)
+    top_five = rank_top_articles(all_articles, count=5, ranker=ranker)
 
     print("💾 Saving to top_articles.json...")
     save_top_articles(top_five)
 
-    print("📤 Writing to selects sheet...")
-    update_selects_sheet(top_five)
+    print("📤 Recording selects...")
+    record_selects(top_five, store)
+    llm_cache.report()
 
     print("🎉 Done.")
+    return top_five
+
+if __name__ == '__main__':
+    main()
+    sheets_sync.main()
+    instrumentation.write_report()
@@ -0,0 +1,115 @@
+import os
+import time
+import random
+import threading
+from urllib.parse import urlparse
+import instrumentation
+
+# --- CONFIG ---
+USER_AGENT = os.getenv("HTTP_USER_AGENT", "InYourBonesBot/1.0 (+https://inyourbones.live/)")
+HTTP_POOL_SIZE = 16
+HTTP_RETRIES = 3
+# Timeouts and resets are retried once; slow hosts shouldn't cost four full timeouts.
+HTTP_ERROR_RETRIES = 1
+BACKOFF_FACTOR = 0.5
+BACKOFF_JITTER = 0.25
+BACKOFF_MAX = 10
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Minimum seconds between requests to the same host; hosts not listed are unthrottled.
+HOST_MIN_INTERVALS = {
+    'www.billboard.com': 0.25,
+    'www.rollingstone.com': 0.25,
+}
+DEFAULT_HEADERS = {
+    'User-Agent': USER_AGENT,
+    'Accept-Encoding': 'gzip, deflate',
+}
+
+# --- BACKOFF ---
+def backoff_delay(attempt, retry_after=None):
+    # Same schedule urllib3 uses for the sync session: factor * 2^n plus jitter,
+    # unless the server asked for a specific wait.
+    if retry_after is not None:
+        try:
+            return min(float(retry_after), BACKOFF_MAX)
+        except ValueError:
+            pass
+    delay = BACKOFF_FACTOR * (2 ** attempt) + random.uniform(0, BACKOFF_JITTER)
+    return min(delay, BACKOFF_MAX)
+
+# --- PER-HOST RATE LIMIT ---
+class HostRateLimiter:
+    def __init__(self, min_intervals=None):
+        self.min_intervals = HOST_MIN_INTERVALS if min_intervals is None else min_intervals
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, url):
+        # Claims the next free slot for the host and returns how long to wait for it.
+        host = urlparse(url).hostname or ''
+        interval = self.min_intervals.get(host)
+        if not interval:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + interval
+        return slot - now
+
+    def wait(self, url):
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+
+rate_limiter = HostRateLimiter()
+
+# --- SHARED SESSION ---
+_session = None
+_session_lock = threading.Lock()
+
+def build_session(pool_size=HTTP_POOL_SIZE, retries=HTTP_RETRIES, limiter=None):
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    limiter = limiter or rate_limiter
+
+    class RateLimitedAdapter(HTTPAdapter):
+        def send(self, request, **kwargs):
+            limiter.wait(request.url)
+            response = super().send(request, **kwargs)
+            instrumentation.count('http.requests')
+            retries = getattr(response.raw, 'retries', None)
+            if retries is not None:
+                instrumentation.count('http.retries', len(retries.history))
+            return response
+
+    retry = Retry(
+        total=retries,
+        connect=min(retries, HTTP_ERROR_RETRIES),
+        read=min(retries, HTTP_ERROR_RETRIES),
+        status=retries,
+        backoff_factor=BACKOFF_FACTOR,
+        backoff_jitter=BACKOFF_JITTER,
+        backoff_max=BACKOFF_MAX,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    # One pool per host, kept alive across calls; pool_maxsize bounds the
+    # number of sockets per host when worker threads share the session.
+    adapter = RateLimitedAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def get_session():
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session()
+    return _session
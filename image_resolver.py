@@ -0,0 +1,112 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+import codecs
+from html.parser import HTMLParser
+import time
+import instrumentation
+from http_client import get_session
+from sqlite_cache import CACHE_DIR, SqliteCache
+
+# --- CONFIG ---
+IMAGE_WORKERS = 16
+IMAGE_TIMEOUT = 5
+HEAD_CHUNK_SIZE = 16 * 1024
+MAX_HEAD_BYTES = 512 * 1024
+IMAGE_CACHE_PATH = os.path.join(CACHE_DIR, "images.sqlite")
+IMAGE_CACHE_TTL = 30 * 24 * 3600
+NEGATIVE_IMAGE_TTL = 12 * 3600
+IMAGE_CACHE_MAX_ENTRIES = 20000
+
+# --- IMAGE CACHE ---
+_image_cache = None
+
+def get_image_cache():
+    global _image_cache
+    if _image_cache is None:
+        _image_cache = SqliteCache(IMAGE_CACHE_PATH, ttl=IMAGE_CACHE_TTL, max_entries=IMAGE_CACHE_MAX_ENTRIES)
+    return _image_cache
+
+# --- HEAD-ONLY META SCANNER ---
+class HeadMetaParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.og_image = None
+        self.twitter_image = None
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'body':
+            self.done = True
+        elif tag == 'meta':
+            attrs = dict(attrs)
+            key = (attrs.get('property') or attrs.get('name') or '').lower()
+            content = attrs.get('content')
+            if not content:
+                return
+            if key == 'og:image' and not self.og_image:
+                self.og_image = content
+                self.done = True
+            elif key == 'twitter:image' and not self.twitter_image:
+                self.twitter_image = content
+
+    def handle_endtag(self, tag):
+        if tag == 'head':
+            self.done = True
+
+    @property
+    def image(self):
+        return self.og_image or self.twitter_image
+
+def scan_head_for_image(chunks, encoding='utf-8', max_bytes=MAX_HEAD_BYTES):
+    parser = HeadMetaParser()
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    bytes_read = 0
+    for chunk in chunks:
+        if not chunk:
+            continue
+        bytes_read += len(chunk)
+        parser.feed(decoder.decode(chunk))
+        if parser.done or bytes_read >= max_bytes:
+            break
+    return parser.image, bytes_read
+
+# --- OG:IMAGE LOOKUP ---
+def fetch_og_image(url, timeout=IMAGE_TIMEOUT):
+    cache = get_image_cache()
+    found, image = cache.get(url)
+    if found:
+        return image
+
+    try:
+        with get_session().get(url, timeout=timeout, stream=True) as response:
+            encoding = response.encoding or 'utf-8'
+            try:
+                codecs.lookup(encoding)
+            except LookupError:
+                encoding = 'utf-8'
+            image, bytes_read = scan_head_for_image(response.iter_content(HEAD_CHUNK_SIZE), encoding)
+            instrumentation.count('http.bytes', bytes_read)
+        # Only remember "no image" for pages that actually loaded, so
+        # transient errors are retried on the next run.
+        if image or response.ok:
+            cache.set(url, image, ttl=None if image else NEGATIVE_IMAGE_TTL)
+        return image
+    except Exception as e:
+        print(f"Failed to fetch image from {url}: {e}")
+
+    return None
+
+# --- BATCH RESOLUTION ---
+def resolve_images(urls, workers=IMAGE_WORKERS):
+    if not urls:
+        return []
+    start = time.perf_counter()
+    cache = get_image_cache()
+    hits_before = cache.hits
+    with ThreadPoolExecutor(max_workers=min(workers, len(urls))) as pool:
+        images = list(pool.map(fetch_og_image, urls))
+    found = sum(1 for image in images if image)
+    print(f"🖼️ Resolved {found}/{len(urls)} og:images in {time.perf_counter() - start:.2f}s "
+          f"({cache.hits - hits_before} from cache)")
+    cache.prune()
+    return images
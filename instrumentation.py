@@ -0,0 +1,126 @@
+import os
+import json
+import time
+import datetime
+import threading
+import functools
+from collections import Counter
+
+# --- CONFIG ---
+# RUN_METRICS=0 turns everything here into no-ops: span() hands back a shared
+# null context, count() returns immediately and @timed leaves functions unwrapped.
+ENABLED = os.getenv("RUN_METRICS", "1").lower() not in ("0", "false", "no", "off")
+RUN_REPORT_FILE = os.getenv("RUN_REPORT_FILE", "run_report.json")
+
+# --- RUN STATE ---
+_lock = threading.Lock()
+_local = threading.local()
+_counters = Counter()
+_spans = {}
+_started = time.time()
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class _Span:
+    # Nested spans are keyed by their path ("scrape/parse_feed"); repeats of
+    # the same path add up. Counters are attributed by snapshotting the run
+    # totals, so work done on worker threads inside the span is included.
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(self.name)
+        self.path = '/'.join(stack)
+        with _lock:
+            # Registered on entry so the report lists spans in the order they started.
+            self.entry = _spans.setdefault(self.path, {'calls': 0, 'seconds': 0.0, 'errors': 0, 'counters': Counter()})
+            self.before = Counter(_counters)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.start
+        _local.stack.pop()
+        with _lock:
+            delta = Counter(_counters)
+            delta.subtract(self.before)
+            entry = self.entry
+            entry['calls'] += 1
+            entry['seconds'] += elapsed
+            entry['errors'] += exc_type is not None
+            entry['counters'].update({k: v for k, v in delta.items() if v})
+        return False
+
+# --- PUBLIC API ---
+def span(name):
+    return _Span(name) if ENABLED else _NULL_SPAN
+
+def timed(name=None):
+    # Decorator form of span(); the span defaults to the function's name.
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _Span(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def count(name, value=1):
+    if not ENABLED or not value:
+        return
+    with _lock:
+        _counters[name] += value
+
+def count_llm_usage(response):
+    # OpenAI responses carry token usage; stubs and older clients may not.
+    if not ENABLED:
+        return
+    count('llm.requests')
+    usage = getattr(response, 'usage', None)
+    if usage is not None:
+        count('llm.prompt_tokens', getattr(usage, 'prompt_tokens', 0) or 0)
+        count('llm.completion_tokens', getattr(usage, 'completion_tokens', 0) or 0)
+
+# --- REPORT ---
+def report():
+    with _lock:
+        spans = [{'name': path, 'calls': entry['calls'], 'seconds': round(entry['seconds'], 4),
+                  'errors': entry['errors'], 'counters': dict(sorted(entry['counters'].items()))}
+                 for path, entry in _spans.items()]
+        counters = dict(sorted(_counters.items()))
+    finished = time.time()
+    return {
+        'started': datetime.datetime.fromtimestamp(_started, datetime.timezone.utc).isoformat(),
+        'finished': datetime.datetime.fromtimestamp(finished, datetime.timezone.utc).isoformat(),
+        'seconds': round(finished - _started, 4),
+        'counters': counters,
+        'spans': spans,
+    }
+
+def write_report(path=RUN_REPORT_FILE):
+    if not ENABLED:
+        return None
+    data = report()
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+    counters = data['counters']
+    print(f"📊 Run report written to {path}: {len(data['spans'])} span(s), "
+          f"{counters.get('http.requests', 0)} HTTP request(s), {counters.get('sheets.calls', 0)} Sheets call(s), "
+          f"{counters.get('llm.prompt_tokens', 0) + counters.get('llm.completion_tokens', 0)} LLM token(s)")
+    return data
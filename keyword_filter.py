@@ -0,0 +1,98 @@
+import re
+
+# --- PATTERN BUILDING ---
+def _variants(keyword, inflections):
+    if not inflections or ' ' in keyword:
+        return [keyword]
+    if keyword.endswith('e'):
+        return [keyword, keyword + 's', keyword + 'd']
+    return [keyword, keyword + 's', keyword + 'es', keyword + 'ed', keyword + 'ing']
+
+def _trie_pattern(words):
+    # Collapse the alternation into a prefix trie so the regex engine walks
+    # shared prefixes once instead of retrying every term at each position.
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = True
+
+    def build(node):
+        end = node.pop('', False)
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items())]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if end:
+            return '(?:' + body + ')?'
+        return body
+
+    return build(trie)
+
+# --- FILTER ENGINE ---
+class KeywordFilter:
+    # A trailing '*' marks a stem ("russia*", "terror*") that matches any word
+    # starting with it: demonyms and derived forms the suffix rules don't reach.
+    def __init__(self, keywords, weights=None, allowed=None, threshold=1.0, word_boundary=True, inflections=True):
+        self.weights = {k.lower(): float(w) for k, w in (weights or {}).items()}
+        self.threshold = threshold
+        self._variant_to_keyword = {}
+        self._stem_to_keyword = {}
+        for keyword in keywords:
+            keyword = keyword.lower().strip()
+            if not keyword:
+                continue
+            if keyword.endswith('*') and len(keyword) > 1:
+                self._stem_to_keyword[keyword.rstrip('*')] = keyword
+                continue
+            for variant in _variants(keyword, inflections and word_boundary):
+                self._variant_to_keyword.setdefault(variant, keyword)
+
+        boundary = r'\b' if word_boundary else ''
+        self._pattern = None
+        if self._variant_to_keyword:
+            self._pattern = re.compile(boundary + '(?:' + _trie_pattern(self._variant_to_keyword) + ')' + boundary)
+        self._stem_pattern = None
+        if self._stem_to_keyword:
+            self._stem_pattern = re.compile(boundary + '(' + _trie_pattern(self._stem_to_keyword) + r')\w*')
+        self._allowed = None
+        allowed = [a.lower().strip() for a in (allowed or []) if a.strip()]
+        if allowed:
+            self._allowed = re.compile(r'\b(?:' + _trie_pattern(allowed) + r')\b')
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            config.get("excluded_keywords", []),
+            weights=config.get("keyword_weights"),
+            allowed=config.get("allowed_phrases"),
+            threshold=config.get("exclude_threshold", 1.0),
+            word_boundary=config.get("match", "word") == "word",
+            inflections=config.get("inflections", True),
+        )
+
+    def matches(self, title):
+        if self._pattern is None and self._stem_pattern is None:
+            return []
+        text = title.lower()
+        if self._allowed is not None:
+            text = self._allowed.sub(' ', text)
+        found = []
+        if self._pattern is not None:
+            for m in self._pattern.finditer(text):
+                keyword = self._variant_to_keyword.get(m.group(0))
+                if keyword and keyword not in found:
+                    found.append(keyword)
+        if self._stem_pattern is not None:
+            for m in self._stem_pattern.finditer(text):
+                keyword = self._stem_to_keyword.get(m.group(1))
+                if keyword and keyword not in found:
+                    found.append(keyword)
+        return found
+
+    def score(self, title):
+        return sum(self.weights.get(k, 1.0) for k in self.matches(title))
+
+    def is_excluded(self, title):
+        return self.score(title) >= self.threshold
@@ -0,0 +1,72 @@
+import os
+import json
+import hashlib
+import instrumentation
+from sqlite_cache import CACHE_DIR, SqliteCache
+
+# --- CONFIG ---
+LLM_CACHE_PATH = os.path.join(CACHE_DIR, "llm.sqlite")
+LLM_CACHE_TTL = 7 * 24 * 3600
+LLM_CACHE_MAX_ENTRIES = 5000
+LLM_CACHE_BYPASS = os.getenv("LLM_CACHE_BYPASS", "").lower() in ("1", "true", "yes")
+KEY_FIELDS = ['model', 'messages', 'temperature', 'max_tokens', 'n']
+
+_llm_cache = None
+
+def get_llm_cache():
+    global _llm_cache
+    if _llm_cache is None:
+        _llm_cache = SqliteCache(LLM_CACHE_PATH, ttl=LLM_CACHE_TTL, max_entries=LLM_CACHE_MAX_ENTRIES)
+    return _llm_cache
+
+# --- KEYS ---
+def cache_key(request, variant=None):
+    # variant separates deliberate re-asks of the same prompt (e.g. retry attempts).
+    payload = {field: request.get(field) for field in KEY_FIELDS}
+    payload['variant'] = variant
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+def _contents(response):
+    return [(choice.message.content or "").strip() for choice in response.choices]
+
+def _lookup(key):
+    if LLM_CACHE_BYPASS:
+        return False, None
+    return get_llm_cache().get(key)
+
+def _store(key, contents):
+    # Empty completions are worth retrying, so they are never cached.
+    if any(contents):
+        get_llm_cache().set(key, contents)
+
+# --- CACHED COMPLETIONS ---
+def cached_completion(client, variant=None, **request):
+    key = cache_key(request, variant)
+    found, contents = _lookup(key)
+    if found:
+        instrumentation.count('llm.cache_hits')
+        return contents
+    response = client.chat.completions.create(**request)
+    instrumentation.count_llm_usage(response)
+    contents = _contents(response)
+    _store(key, contents)
+    return contents
+
+async def cached_completion_async(async_client, variant=None, **request):
+    key = cache_key(request, variant)
+    found, contents = _lookup(key)
+    if found:
+        instrumentation.count('llm.cache_hits')
+        return contents
+    response = await async_client.chat.completions.create(**request)
+    instrumentation.count_llm_usage(response)
+    contents = _contents(response)
+    _store(key, contents)
+    return contents
+
+def report():
+    cache = get_llm_cache()
+    cache.prune()
+    bypass = " (bypass on)" if LLM_CACHE_BYPASS else ""
+    print(f"🧠 LLM cache: {cache.hits} hit(s) / {cache.misses} miss(es){bypass}")
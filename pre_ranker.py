@@ -0,0 +1,132 @@
+import os
+import re
+import zlib
+import hashlib
+import numpy as np
+from sqlite_cache import CACHE_DIR
+
+# --- CONFIG ---
+HASH_DIM = 2 ** 15
+PRIOR_WEIGHT = 1.0
+TRAIN_EPOCHS = 200
+LEARNING_RATE = 0.5
+L2_PENALTY = 1e-3
+MODEL_CACHE_PATH = os.path.join(CACHE_DIR, "pre_ranker.npz")
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9'’\-]*")
+
+# Editorial criteria: uplifting, live-music and tour news up; bad news down.
+POSITIVE_TERMS = [
+    'tour', 'tours', 'tour dates', 'announce', 'announces', 'live', 'festival', 'concert', 'concerts',
+    'lineup', 'headline', 'headlining', 'residency', 'stadium', 'sold out', 'sold-out', 'stage',
+    'new album', 'new single', 'new song', 'new music', 'release', 'releases', 'share', 'shares',
+    'debut', 'premiere', 'video', 'surprise', 'reunion', 'reunite', 'reunites', 'anniversary',
+    'celebrate', 'celebrates', 'collab', 'collaboration', 'joins', 'cover', 'covers', 'record',
+    'milestone', 'wins', 'charity', 'raises', 'fans', 'special guest', 'deluxe', 'ep',
+]
+NEGATIVE_TERMS = [
+    'dies', 'dead', 'death', 'died', 'obituary', 'rip', 'cancel', 'cancels', 'canceled', 'cancelled',
+    'postpone', 'postpones', 'postponed', 'hiatus', 'lawsuit', 'sued', 'sues', 'accused', 'allegations',
+    'arrested', 'hospitalized', 'illness', 'crash', 'accident', 'feud', 'diss', 'slams', 'responds',
+    'breakup', 'split', 'splits', 'injured', 'injury', 'fire', 'fired', 'quits', 'tragic',
+]
+
+# --- FEATURES ---
+def _hash(feature):
+    return zlib.crc32(feature.encode('utf-8')) % HASH_DIM
+
+def _features(title):
+    tokens = TOKEN_RE.findall((title or '').lower().replace('’', "'"))
+    feats = set(tokens)
+    feats.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    return feats
+
+def featurize(titles, idf=None):
+    # Sparse TF-IDF in COO form: rows[k], cols[k], vals[k] with L2-normalized rows.
+    rows, cols = [], []
+    for i, title in enumerate(titles):
+        for h in {_hash(f) for f in _features(title)}:
+            rows.append(i)
+            cols.append(h)
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    if idf is None:
+        df = np.bincount(cols, minlength=HASH_DIM)
+        idf = np.log((1 + len(titles)) / (1 + df)) + 1.0
+    vals = idf[cols].astype(np.float64)
+    norms = np.sqrt(np.bincount(rows, weights=vals ** 2, minlength=len(titles)))
+    vals = vals / np.where(norms > 0, norms, 1.0)[rows]
+    return rows, cols, vals, idf
+
+def _dot(rows, cols, vals, weights, n):
+    return np.bincount(rows, weights=vals * weights[cols], minlength=n)
+
+def prior_weights():
+    weights = np.zeros(HASH_DIM)
+    for term in POSITIVE_TERMS:
+        weights[_hash(term)] += PRIOR_WEIGHT
+    for term in NEGATIVE_TERMS:
+        weights[_hash(term)] -= PRIOR_WEIGHT
+    return weights
+
+# --- MODEL ---
+class PreRanker:
+    def __init__(self, weights=None, bias=0.0, idf=None):
+        self.weights = prior_weights() if weights is None else weights
+        self.bias = bias
+        self.idf = idf
+
+    def score(self, titles):
+        titles = list(titles)
+        if not titles:
+            return np.zeros(0)
+        rows, cols, vals, _ = featurize(titles, self.idf)
+        return _dot(rows, cols, vals, self.weights, len(titles)) + self.bias
+
+    def top_k(self, articles, k):
+        if len(articles) <= k:
+            return list(articles)
+        scores = self.score(a['title'] for a in articles)
+        # Stable sort keeps the newest-first order among equal scores.
+        order = np.argsort(-scores, kind='stable')[:k]
+        return [articles[i] for i in order]
+
+def _training_hash(examples):
+    digest = hashlib.sha256()
+    for title, label in examples:
+        digest.update(f"{label}\t{title}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+def train(examples, cache_path=MODEL_CACHE_PATH):
+    # examples: list of (title, label) with label 1 for approved, 0 for rejected.
+    labels = np.asarray([label for _, label in examples], dtype=np.float64)
+    if len(examples) < 10 or labels.min() == labels.max():
+        print(f"⚖️ Pre-ranker: {len(examples)} labelled headline(s), using editorial priors only")
+        return PreRanker()
+
+    # The key covers the whole training set, which grows with every run, so
+    # this only saves work on reruns over unchanged data; a new day means a
+    # fresh featurize and fit (cheap next to the GPT call it trims).
+    key = _training_hash(examples)
+    if cache_path and os.path.exists(cache_path):
+        cached = np.load(cache_path, allow_pickle=False)
+        if str(cached['key']) == key:
+            print(f"⚖️ Pre-ranker: reusing model trained on {len(examples)} headline(s)")
+            return PreRanker(cached['weights'], float(cached['bias']), cached['idf'])
+
+    rows, cols, vals, idf = featurize([title for title, _ in examples])
+    n = len(examples)
+    weights = prior_weights()
+    bias = 0.0
+    # Plain batch gradient descent on logistic loss, starting from the priors.
+    for _ in range(TRAIN_EPOCHS):
+        p = 1.0 / (1.0 + np.exp(-(_dot(rows, cols, vals, weights, n) + bias)))
+        error = p - labels
+        grad = np.bincount(cols, weights=vals * error[rows], minlength=HASH_DIM) / n
+        weights -= LEARNING_RATE * (grad + L2_PENALTY * weights)
+        bias -= LEARNING_RATE * error.mean()
+
+    if cache_path:
+        os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+        np.savez(cache_path, key=key, weights=weights, bias=bias, idf=idf)
+    print(f"⚖️ Pre-ranker: trained on {n} headline(s) ({int(labels.sum())} approved)")
+    return PreRanker(weights, bias, idf)
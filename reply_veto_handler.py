@@ -5,6 +5,9 @@ from datetime import datetime
 from dotenv import load_dotenv
 from twilio.rest import Client
 import gspread
+import article_store
+from article_store import ArticleStore
+from sheets_batch import col_letter
 
 # --- CONFIG ---
 load_dotenv()
@@ -16,6 +19,8 @@ GOOGLE_SHEET_NAME = os.getenv("GOOGLE_SHEET_NAME")
 GOOGLE_CREDENTIALS = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
 
 JSON_PATH = "top_articles_with_captions.json"
+VETOED = "🚫 Vetoed"
+APPROVED = "✅ Approved"
 
 # --- POLL & PARSE REPLIES ---
 def fetch_latest_reply():
@@ -42,18 +47,36 @@ def update_json_vetoes(indices):
     with open(JSON_PATH, "r", encoding="utf-8") as f:
         data = json.load(f)
 
+    changed = 0
     for idx in indices:
-        if 1 <= idx <= len(data):
+        if 1 <= idx <= len(data) and not data[idx - 1].get("vetoed"):
             data[idx - 1]["vetoed"] = True
+            changed += 1
             print(f"🚫 Vetoed in JSON: {data[idx - 1]['title']}")
 
+    if not changed:
+        print("⏭️ JSON veto flags already up to date.")
+        return indices
+
     with open(JSON_PATH, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
-        print("✅ Updated JSON with veto flags.")
+        print(f"✅ Updated JSON with {changed} new veto flag(s).")
 
     return indices
 
 
+def plan_approval_changes(rows, approval_col, veto_indices):
+    changes = []
+    for i, row in enumerate(rows, start=2):  # skip header
+        status = VETOED if i - 1 in veto_indices else APPROVED
+        current = row[approval_col] if len(row) > approval_col else ""
+        if current != status:
+            changes.append((i, status))
+            if status == VETOED:
+                print(f"🚫 Vetoed in sheet: Row {i}")
+    return changes
+
+
 def update_sheet_vetoes(veto_indices):
     gc = gspread.service_account(filename=GOOGLE_CREDENTIALS)
     sheet = gc.open(GOOGLE_SHEET_NAME)
@@ -68,16 +91,29 @@ def update_sheet_vetoes(veto_indices):
     rows = worksheet.get_all_values()
     headers = rows[0]
 
+    data = []
     if "Approval" not in headers:
-        worksheet.update_cell(1, len(headers) + 1, "Approval")
         headers.append("Approval")
-
-    for i, row in enumerate(rows[1:], start=2):  # skip header
-        if i - 1 in veto_indices:
-            worksheet.update_cell(i, len(headers), "🚫 Vetoed")
-            print(f"🚫 Vetoed in sheet: Row {i}")
-        else:
-            worksheet.update_cell(i, len(headers), "✅ Approved")
+        data.append({"range": f"{col_letter(len(headers))}1", "values": [["Approval"]]})
+    approval_col = headers.index("Approval")
+
+    changes = plan_approval_changes(rows[1:], approval_col, veto_indices)
+    letter = col_letter(approval_col + 1)
+    data += [{"range": f"{letter}{row_num}", "values": [[status]]} for row_num, status in changes]
+
+    if data:
+        worksheet.batch_update(data)
+
+    store = ArticleStore()
+    for status, store_status in ((VETOED, article_store.VETOED), (APPROVED, article_store.APPROVED)):
+        links = [rows[row_num - 1][1] for row_num, s in changes if s == status and len(rows[row_num - 1]) > 1]
+        store.set_status(links, store_status)
+
+    vetoed = sum(1 for _, status in changes if status == VETOED)
+    approved = len(changes) - vetoed
+    print(f"📊 Veto sync: {vetoed} newly vetoed, {approved} newly approved, "
+          f"{len(rows) - 1 - len(changes)} unchanged")
+    return changes
 
 
 # --- MAIN ---
@@ -1,23 +1,18 @@
 import os
-import base64
-import feedparser
 import datetime
-import gspread
 import json
-from dateutil import parser
-from oauth2client.service_account import ServiceAccountCredentials
 import pytz
-import requests
-from bs4 import BeautifulSoup
-
-# --- HANDLE CREDS FROM ENV ---
-creds_b64 = os.getenv("CREDS_B64")
-if creds_b64:
-    with open("creds.json", "w", encoding="utf-8") as f:
-        decoded = base64.b64decode(creds_b64).decode("utf-8")
-        f.write(decoded)
-else:
-    print("⚠️ CREDS_B64 not found in environment. Google Sheets access may fail.")
+import clients
+import instrumentation
+from article_store import ArticleStore
+from dates import iso_utc, iso_utc_from_struct
+from feed_cache import FeedCache
+from feed_fetcher import fetch_feeds
+from feed_state import HighWaterMarks
+from image_resolver import fetch_og_image, resolve_images
+from keyword_filter import KeywordFilter
+from sheets_batch import append_rows, replace_day_rows
+from story_clusters import cluster_articles
 
 # --- CONFIG ---
 RSS_FEEDS = [
@@ -38,23 +33,14 @@ RSS_FEEDS = [
 
 GOOGLE_SHEET_NAME = 'InYourBones Daily Music News'
 MAX_RESULTS = 100
+# "daily" re-scans yesterday (PST); "incremental" only ingests entries past each feed's high-water mark.
+SCRAPE_MODE = os.getenv("SCRAPE_MODE", "daily")
 
 # --- LOAD FILTERS ---
 with open('filters.json', 'r', encoding='utf-8') as f:
     filter_config = json.load(f)
 
-EXCLUDE_KEYWORDS = filter_config.get("excluded_keywords", [])
-
-# --- SETUP GOOGLE SHEETS ---
-scope = ['https://spreadsheets.google.com/feeds',
-         'https://www.googleapis.com/auth/spreadsheets',
-         'https://www.googleapis.com/auth/drive.file',
-         'https://www.googleapis.com/auth/drive']
-
-creds = ServiceAccountCredentials.from_json_keyfile_name('creds.json', scope)
-gsheet = gspread.authorize(creds)
-print("Available spreadsheets:", [s.title for s in gsheet.openall()])
-spreadsheet = gsheet.open(GOOGLE_SHEET_NAME)
+KEYWORD_FILTER = KeywordFilter.from_config(filter_config)
 
 # --- HELPERS ---
 def is_from_yesterday_pst(published_dt):
@@ -69,10 +55,9 @@ def is_from_yesterday_pst(published_dt):
     return published.date() == yesterday_pst.date()
 
 def is_relevant(title):
-    title_lower = title.lower()
-    return not any(keyword in title_lower for keyword in EXCLUDE_KEYWORDS)
+    return not KEYWORD_FILTER.is_excluded(title)
 
-def extract_image(entry):
+def extract_media_image(entry):
     for key in ['media_content', 'media_thumbnail']:
         if key in entry:
             media = entry[key]
@@ -86,44 +71,69 @@ def extract_image(entry):
             if 'image' in enclosure.type or 'jpg' in enclosure.href:
                 return enclosure.href
 
-    try:
-        response = requests.get(entry.link, timeout=5)
-        soup = BeautifulSoup(response.text, 'html.parser')
-        og_image = soup.find("meta", property="og:image")
-        if og_image and og_image.get("content"):
-            return og_image["content"]
-        twitter_image = soup.find("meta", attrs={"name": "twitter:image"})
-        if twitter_image and twitter_image.get("content"):
-            return twitter_image["content"]
-    except Exception as e:
-        print(f"Failed to fetch image from {entry.link}: {e}")
-
     return None
 
+def extract_image(entry):
+    return extract_media_image(entry) or fetch_og_image(entry.link)
+
+def resolve_missing_images(articles):
+    missing = [a for a in articles if not a['image']]
+    for article, image_url in zip(missing, resolve_images([a['link'] for a in missing])):
+        article['image'] = image_url
+
 # --- MAIN SCRAPER ---
-def fetch_recent_articles():
+@instrumentation.timed('parse_feed')
+def load_feed(fetched, cache):
+    import feedparser
+    if cache and fetched['status'] == 304:
+        return cache.load(fetched['url'])
+    feed = feedparser.parse(fetched['body'])
+    if cache and fetched['status'] == 200:
+        cache.store(fetched['url'], feed, fetched['etag'], fetched['last_modified'], len(fetched['body']))
+    return feed
+
+@instrumentation.timed()
+def fetch_recent_articles(cache=None, marks=None):
     results = []
     seen_titles = set()
-    for url in RSS_FEEDS:
-        feed = feedparser.parse(url)
+    with instrumentation.span('fetch_feeds'):
+        feeds = fetch_feeds(RSS_FEEDS, cache=cache)
+    for fetched in feeds:
+        if fetched['error'] is not None:
+            continue
+        feed = load_feed(fetched, cache)
+        if feed is None:
+            continue
         for entry in feed.entries:
-            if is_from_yesterday_pst(entry.published_parsed) and is_relevant(entry.title):
+            if marks is not None:
+                fresh = marks.is_new(fetched['url'], entry)
+            else:
+                fresh = is_from_yesterday_pst(entry.published_parsed)
+            if fresh and is_relevant(entry.title):
                 title = entry.title.strip()
                 if title not in seen_titles:
                     seen_titles.add(title)
-                    image_url = extract_image(entry)
                     results.append({
                         'title': title,
                         'link': entry.link,
                         'source': feed.feed.title,
                         'published': entry.published,
-                        'image': image_url
+                        'published_utc': iso_utc_from_struct(entry.get('published_parsed')) or iso_utc(entry.published),
+                        'image': extract_media_image(entry)
                     })
-    print(f"Fetched {len(results)} articles from yesterday (PST) (deduplicated by title)")
-    return sorted(results, key=lambda a: a['published'], reverse=True)
+        if marks is not None:
+            marks.advance(fetched['url'], feed.entries)
+    with instrumentation.span('resolve_images'):
+        resolve_missing_images(results)
+    window = "since the last run" if marks is not None else "from yesterday (PST)"
+    print(f"Fetched {len(results)} articles {window} (deduplicated by title)")
+    if cache:
+        cache.report()
+    return sorted(results, key=lambda a: a['published_utc'], reverse=True)
 
 # --- WRITE TO MONTHLY SHEET ---
-def update_monthly_sheet(articles):
+@instrumentation.timed()
+def update_monthly_sheet(articles, incremental=False):
     pacific = pytz.timezone("America/Los_Angeles")
     now = datetime.datetime.now(pacific)
     yesterday = now - datetime.timedelta(days=1)
@@ -131,44 +141,16 @@ def update_monthly_sheet(articles):
     date_str = yesterday.strftime('%Y-%m-%d')
     print(f"Preparing to update sheet: {sheet_tab} for date {date_str}")
 
+    import gspread
+    spreadsheet = clients.spreadsheet(GOOGLE_SHEET_NAME)
+
     try:
         worksheet = spreadsheet.worksheet(sheet_tab)
     except gspread.exceptions.WorksheetNotFound:
-        worksheet = spreadsheet.add_worksheet(title=sheet_tab, rows="1000", cols="5")
-
-    all_values = worksheet.get_all_values()
-    print(f"Current sheet row count: {len(all_values)}")
+        worksheet = spreadsheet.add_worksheet(title=sheet_tab, rows="1000", cols="6")
 
-    # Set or update headers
-    default_headers = ['Title', 'Link', 'Source', 'Published', 'Image']
-    if all_values:
-        headers = all_values[0]
-        if 'Image' not in headers:
-            headers.append('Image')
-    else:
-        headers = default_headers
-
-    filtered_values = []
-    removed_count = 0
-
-    for row in all_values[1:]:
-        if row and len(row) >= 4:
-            try:
-                parsed_date = parser.parse(row[3]).astimezone(pacific).date()
-                if parsed_date.strftime('%Y-%m-%d') != date_str:
-                    while len(row) < len(headers):
-                        row.append('')
-                    filtered_values.append(row)
-                else:
-                    removed_count += 1
-            except Exception as e:
-                print(f"Error parsing row date: {row[3]} -> {e}")
-                while len(row) < len(headers):
-                    row.append('')
-                filtered_values.append(row)
-    print(f"Removed {removed_count} rows from {date_str}")
-
-    new_rows = [[a['title'], a['link'], a['source'], a['published'], a.get('image', '')] for a in articles[:MAX_RESULTS]]
+    new_rows = [[a['title'], a['link'], a['source'], a['published'], a.get('image', ''), a.get('published_utc', '')]
+                for a in articles[:MAX_RESULTS]]
     unique_rows = []
     seen = set()
     for row in new_rows:
@@ -177,15 +159,33 @@ def update_monthly_sheet(articles):
             unique_rows.append(row)
 
     print(f"Appending {len(unique_rows)} new unique rows")
-    final_data = [headers] + filtered_values + unique_rows
-    worksheet.clear()
-    worksheet.update(values=final_data, range_name='A1')
+    default_headers = ['Title', 'Link', 'Source', 'Published', 'Image', 'Published UTC']
+    if incremental:
+        # High-water marks guarantee these rows are new, so nothing needs replacing.
+        append_rows(worksheet, default_headers, unique_rows)
+    else:
+        # Drop only yesterday's block and append the fresh rows in one batchUpdate.
+        replace_day_rows(worksheet, default_headers, 4, date_str, pacific, unique_rows, iso_col=6)
 
 # --- MAIN ---
-if __name__ == '__main__':
-    articles = fetch_recent_articles()
-    update_monthly_sheet(articles)
+def main():
+    marks = HighWaterMarks() if SCRAPE_MODE == "incremental" else None
+    articles = fetch_recent_articles(cache=FeedCache(), marks=marks)
+    # The store only keeps what the monthly tab gets, or push_monthly would add the rest.
+    with instrumentation.span('store_upsert'):
+        ArticleStore().upsert_articles(articles[:MAX_RESULTS], day=datetime.datetime.now(pytz.timezone("America/Los_Angeles")).date().isoformat())
+    update_monthly_sheet(articles, incremental=marks is not None)
+    if marks is not None:
+        marks.save()
     print(f"Posted {min(len(articles), MAX_RESULTS)} unique articles to current month's sheet.")
 
+    # Fold cross-feed duplicates so the ranker sees one headline per story.
+    with instrumentation.span('cluster_articles'):
+        stories = cluster_articles(articles)
     with open('latest_articles.json', 'w', encoding='utf-8') as f:
-        json.dump(articles[:MAX_RESULTS], f, indent=2)
+        json.dump(stories[:MAX_RESULTS], f, indent=2)
+    return stories[:MAX_RESULTS]
+
+if __name__ == '__main__':
+    main()
+    instrumentation.write_report()
@@ -2,99 +2,170 @@
 
 import os
 import json
+import time
 import datetime
-import base64
 import sys
-from xml.etree.ElementTree import Element, SubElement, ElementTree
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
-from dateutil import parser as date_parser
+import tempfile
+from xml.etree.ElementTree import iterparse
+from xml.sax.saxutils import XMLGenerator
+from xml.sax.xmlreader import AttributesImpl
+import clients
+import instrumentation
+from dates import parse_date, parse_iso_utc
+import article_store
+from article_store import ArticleStore
+from sheets_sync import VETO_MARKS
+from sqlite_cache import CACHE_DIR
 
 SITE_URL = 'https://inyourbones.live/'
 FEED_TITLE = 'InYourBones Daily Music News'
 FEED_DESCRIPTION = 'Top 5 daily music stories handpicked by InYourBones'
+MEDIA_NS = 'http://search.yahoo.com/mrss/'
+RECENT_DAYS = 3
+TAB_CACHE_PATH = os.path.join(CACHE_DIR, 'sheet_tabs.json')
+TAB_CACHE_TTL = 6 * 3600
 
 def _get_output_file(loadAll):
     return 'feed_all.xml' if loadAll else 'feed.xml'
 
-def load_articles_from_sheets(loadAll=False):
+# --- TAB METADATA ---
+_tab_cache = {}
+
+def _month_start(day):
+    return day.replace(day=1)
+
+def month_tabs(start, end):
+    # Every '%B %Y (selects)' tab whose month intersects [start, end].
+    tabs = []
+    month = _month_start(start)
+    while month <= end:
+        tabs.append(month.strftime('%B %Y (selects)'))
+        month = _month_start(month + datetime.timedelta(days=32))
+    return tabs
+
+def sheet_tabs(service, sheet_id, refresh=False):
+    # Tab titles change about once a month, so keep them in memory and on disk.
+    cached = _tab_cache.get(sheet_id)
+    if cached is None and not refresh:
+        try:
+            with open(TAB_CACHE_PATH, 'r', encoding='utf-8') as f:
+                record = json.load(f).get(sheet_id)
+            if record and time.time() - record['fetched_at'] < TAB_CACHE_TTL:
+                cached = set(record['titles'])
+        except (OSError, ValueError, KeyError):
+            pass
+    if cached is None or refresh:
+        meta = service.spreadsheets().get(spreadsheetId=sheet_id, fields='sheets.properties.title').execute()
+        cached = {sheet['properties']['title'] for sheet in meta.get('sheets', [])}
+        try:
+            os.makedirs(os.path.dirname(TAB_CACHE_PATH) or '.', exist_ok=True)
+            with open(TAB_CACHE_PATH, 'w', encoding='utf-8') as f:
+                json.dump({sheet_id: {'titles': sorted(cached), 'fetched_at': time.time()}}, f)
+        except OSError:
+            pass
+    _tab_cache[sheet_id] = cached
+    return cached
+
+def fetch_tab_rows(service, sheet_id, tabs, refresh=False):
+    # One values.batchGet for every tab in the window; tabs that don't exist
+    # are left out since a single bad range fails the whole batch.
+    existing = sheet_tabs(service, sheet_id, refresh=refresh)
+    if not refresh and any(tab not in existing for tab in tabs):
+        return fetch_tab_rows(service, sheet_id, tabs, refresh=True)
+    present = [tab for tab in tabs if tab in existing]
+    if not present:
+        return []
+    try:
+        result = service.spreadsheets().values().batchGet(
+            spreadsheetId=sheet_id,
+            ranges=[f"'{tab}'!A2:H" for tab in present]
+        ).execute()
+    except Exception:
+        # Cached titles can go stale (a tab renamed or removed); retry once fresh.
+        if refresh:
+            raise
+        return fetch_tab_rows(service, sheet_id, tabs, refresh=True)
+    return [(tab, value_range.get('values', [])) for tab, value_range in zip(present, result.get('valueRanges', []))]
+
+@instrumentation.timed()
+def load_articles_from_sheets(loadAll=False, vetoed=None, today=None, service=None, sheet_id=None):
     print(f"🛠️  Running with loadAll={loadAll}")
-    today = datetime.datetime.now().date()
+    today = today or datetime.datetime.now().date()
     print(f"📅 Today: {today}")
 
-    creds_b64 = os.getenv("CREDS_B64")
-    sheet_id = os.getenv("SHEET_ID")
-
-    if not creds_b64 or not sheet_id:
-        raise RuntimeError("Missing CREDS_B64 or SHEET_ID env vars")
-
-    creds_json = base64.b64decode(creds_b64).decode("utf-8")
-    creds = service_account.Credentials.from_service_account_info(json.loads(creds_json))
-    service = build('sheets', 'v4', credentials=creds)
-
-    tab_name = datetime.datetime.now().strftime('%B %Y (selects)')
+    if service is None:
+        sheet_id = os.getenv("SHEET_ID")
+        if not os.getenv("CREDS_B64") or not sheet_id:
+            raise RuntimeError("Missing CREDS_B64 or SHEET_ID env vars")
+        service = clients.sheets_service()
 
-    result = service.spreadsheets().values().get(
-        spreadsheetId=sheet_id,
-        range=f"{tab_name}!A2:G"
-    ).execute()
+    if loadAll:
+        window_start = _month_start(_month_start(today) - datetime.timedelta(days=1))
+    else:
+        window_start = today - datetime.timedelta(days=RECENT_DAYS)
+    tabs = month_tabs(window_start, today)
+    print(f"📑 Loading {', '.join(tabs)}")
 
-    rows = result.get('values', [])
     all_articles = []
     seen_links = set()
     seen_titles = set()
 
-    for row_num, row in enumerate(rows, start=2):
-        if len(row) < 4:
-            print(f"⚠️ Skipping short row (less than 4 cols) at row {row_num}: {row}")
-            continue
-
-        try:
-            title = row[0]
-            link = row[1]
-            source = row[2]
-            published = row[3]
-            caption = row[4] if len(row) > 4 else ''
-            image = row[5] if len(row) > 5 else ''
-            approval = row[6].strip() if len(row) > 6 else ''
-            print(f"🔍 Processing row {row_num}: {title} ({published}) with approval status ({approval})")
-
-            if approval == '❌':
-                print(f"🚫 Skipping disapproved row {row_num}: {title}")
+    # Newest tab first so a story repeated across months keeps its latest row.
+    for tab, rows in reversed(fetch_tab_rows(service, sheet_id, tabs)):
+        for row_num, row in enumerate(rows, start=2):
+            if len(row) < 4:
+                print(f"⚠️ Skipping short row (less than 4 cols) at {tab} row {row_num}: {row}")
                 continue
 
-            published_date = date_parser.parse(published)
-
-        except Exception as e:
-            print(f"⚠️ Error processing row {row_num}: {row} — {e}")
-            continue
-
-        # Deduplication
-        if link in seen_links or title in seen_titles:
-            print(f"🔁 Duplicate skipped at row {row_num}: {title}")
-            continue
-        seen_links.add(link)
-        seen_titles.add(title)
-
-        article = {
-            "title": title,
-            "link": link,
-            "source": source,
-            "published": published,
-            "caption": caption,
-            "image": image if loadAll else '',
-            "published_dt": published_date
-        }
+            try:
+                title = row[0]
+                link = row[1]
+                source = row[2]
+                published = row[3]
+                caption = row[4] if len(row) > 4 else ''
+                image = row[5] if len(row) > 5 else ''
+                approval = row[6].strip() if len(row) > 6 else ''
+                published_utc = row[7].strip() if len(row) > 7 else ''
+                print(f"🔍 Processing row {row_num}: {title} ({published}) with approval status ({approval})")
+
+                if approval in VETO_MARKS:
+                    if vetoed is not None:
+                        vetoed.add(link)
+                    print(f"🚫 Skipping disapproved row {row_num}: {title}")
+                    continue
+
+                published_date = parse_iso_utc(published_utc) if published_utc else parse_date(published)
+
+            except Exception as e:
+                print(f"⚠️ Error processing row {row_num}: {row} — {e}")
+                continue
 
-        all_articles.append(article)
-        print(f"✅ Row accepted at row {row_num}: {title} ({published_date.isoformat()})")
+            # Deduplication
+            if link in seen_links or title in seen_titles:
+                print(f"🔁 Duplicate skipped at row {row_num}: {title}")
+                continue
+            seen_links.add(link)
+            seen_titles.add(title)
+
+            article = {
+                "title": title,
+                "link": link,
+                "source": source,
+                "published": published,
+                "caption": caption,
+                "image": image if loadAll else '',
+                "published_dt": published_date
+            }
+
+            all_articles.append(article)
+            print(f"✅ Row accepted at row {row_num}: {title} ({published_date.isoformat()})")
 
     # Sort by date descending
     all_articles = sorted(all_articles, key=lambda a: a["published_dt"], reverse=True)
 
     if not loadAll:
         # Try to get top 5 from the last 3 days
-        recent_articles = [a for a in all_articles if (today - a["published_dt"].date()).days <= 3]
+        recent_articles = [a for a in all_articles if (today - a["published_dt"].date()).days <= RECENT_DAYS]
         if len(recent_articles) >= 5:
             articles = recent_articles[:5]
             print(f"🔍 Found {len(recent_articles)} recent articles, using top 5.")
@@ -111,52 +182,198 @@ def load_articles_from_sheets(loadAll=False):
     return articles
 
 
-def generate_rss(loadAll=False):
+@instrumentation.timed()
+def load_articles_from_store(loadAll=False, store=None, vetoed=None):
+    # Same selection as load_articles_from_sheets, answered by the local index.
+    print(f"🛠️  Running with loadAll={loadAll} (article store)")
+    store = store or ArticleStore()
+    if loadAll:
+        rows = store.selected(include_vetoed=True)
+        if vetoed is not None:
+            vetoed.update(r['link'] for r in rows if r['status'] == article_store.VETOED)
+        rows = [r for r in rows if r['status'] != article_store.VETOED]
+    else:
+        since = datetime.datetime.combine(datetime.datetime.now().date() - datetime.timedelta(days=3), datetime.time())
+        rows = store.recent_selected(days=(datetime.datetime.now() - since).total_seconds() / 86400, limit=5)
+        if len(rows) >= 5:
+            print(f"🔍 Found {len(rows)} recent articles, using top 5.")
+        else:
+            print(f"🔍 Only found {len(rows)} articles from the last 3 days, falling back to top 5 overall.")
+            rows = store.selected(limit=5)
+
+    articles = []
+    seen_titles = set()
+    for row in rows:
+        if row['title'] in seen_titles:
+            continue
+        seen_titles.add(row['title'])
+        articles.append({
+            "title": row['title'],
+            "link": row['link'],
+            "source": row['source'],
+            "published": row['published'],
+            "caption": row['caption'] or '',
+            "image": (row['image'] or '') if loadAll else '',
+        })
+
+    print("\n📝 Final sorted article titles:")
+    for a in articles:
+        print(f" - {a['title']} @ {a['published']}")
+    return articles
+
+
+# --- STREAMING RSS OUTPUT ---
+def _item_fields(article):
+    return {
+        'title': article.get('title', ''),
+        'link': article.get('link', ''),
+        'guid': article.get('guid') or article.get('link', ''),
+        'description': article.get('caption', ''),
+        'pubDate': article.get('published', ''),
+        'image': article.get('image', ''),
+    }
+
+class RSSStreamWriter:
+    # Emits one <item> at a time through XMLGenerator, so output never sits
+    # in memory as a tree. Writes to a temp file that replaces the target on close.
+    def __init__(self, output_file):
+        self.output_file = output_file
+        directory = os.path.dirname(os.path.abspath(output_file))
+        fd, self.tmp_path = tempfile.mkstemp(dir=directory, suffix='.xml.tmp')
+        self.file = os.fdopen(fd, 'w', encoding='utf-8')
+        self.xml = XMLGenerator(self.file, encoding='utf-8', short_empty_elements=True)
+        self.count = 0
+
+    def __enter__(self):
+        self.file.write("<?xml version='1.0' encoding='utf-8'?>\n")
+        self.xml.startElement('rss', AttributesImpl({'version': '2.0', 'xmlns:media': MEDIA_NS}))
+        self.xml.startElement('channel', AttributesImpl({}))
+        self._text('title', FEED_TITLE)
+        self._text('link', SITE_URL)
+        self._text('description', FEED_DESCRIPTION)
+        self._text('lastBuildDate', datetime.datetime.utcnow().strftime('%a, %d %b %Y %H:%M:%S +0000'))
+        return self
+
+    def _text(self, tag, text):
+        self.xml.startElement(tag, AttributesImpl({}))
+        self.xml.characters(text or '')
+        self.xml.endElement(tag)
+
+    def write_item(self, fields):
+        self.file.write('\n')
+        self.xml.startElement('item', AttributesImpl({}))
+        for tag in ('title', 'link', 'guid', 'description', 'pubDate'):
+            self._text(tag, fields[tag])
+        if fields.get('image'):
+            self.xml.startElement('media:content', AttributesImpl({'url': fields['image'], 'medium': 'image'}))
+            self.xml.endElement('media:content')
+        self.xml.endElement('item')
+        self.count += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.file.write('\n')
+                self.xml.endElement('channel')
+                self.xml.endElement('rss')
+                self.xml.endDocument()
+        finally:
+            self.file.close()
+        if exc_type is None:
+            os.replace(self.tmp_path, self.output_file)
+        else:
+            os.remove(self.tmp_path)
+        return False
+
+def iter_feed_items(path):
+    # Streams <item> elements out of an existing feed, clearing each one once
+    # read so memory stays flat however large the archive gets.
+    if not os.path.exists(path):
+        return
+    channel = None
+    for event, elem in iterparse(path, events=('start', 'end')):
+        if event == 'start':
+            if elem.tag == 'channel':
+                channel = elem
+            continue
+        if elem.tag != 'item':
+            continue
+        media = elem.find(f'{{{MEDIA_NS}}}content')
+        yield {
+            'title': elem.findtext('title', ''),
+            'link': elem.findtext('link', ''),
+            'guid': elem.findtext('guid', '') or elem.findtext('link', ''),
+            'description': elem.findtext('description', ''),
+            'pubDate': elem.findtext('pubDate', ''),
+            'image': media.get('url', '') if media is not None else '',
+        }
+        elem.clear()
+        if channel is not None:
+            channel.clear()
+
+@instrumentation.timed()
+def write_rss(articles, output_file):
+    with RSSStreamWriter(output_file) as writer:
+        for article in articles:
+            writer.write_item(_item_fields(article))
+    return writer.count
+
+@instrumentation.timed()
+def merge_rss(articles, output_file, drop_guids=None):
+    # New guids go on top (newest first); archived items keep their order,
+    # pick up fresh captions/images for guids that were re-loaded, and items
+    # in drop_guids (e.g. vetoed since) are removed.
+    drop_guids = drop_guids or set()
+    fresh = {}
+    for article in articles:
+        fields = _item_fields(article)
+        fresh.setdefault(fields['guid'], fields)
+    archived = {item['guid'] for item in iter_feed_items(output_file)}
+
+    with RSSStreamWriter(output_file) as writer:
+        added = 0
+        for guid, fields in fresh.items():
+            if guid not in archived and guid not in drop_guids:
+                writer.write_item(fields)
+                added += 1
+        for item in iter_feed_items(output_file):
+            if item['guid'] in drop_guids:
+                continue
+            current = fresh.get(item['guid'])
+            if current:
+                item = dict(current, image=current['image'] or item['image'])
+            writer.write_item(item)
+    print(f"🗂️ Archive merge: {added} new item(s), {writer.count - added} kept from {output_file}")
+    return writer.count
+
+
+def generate_rss(loadAll=False, fromStore=False):
     print(f"🛠️  Running generateRSS with loadAll={loadAll}")
     print(f"📅 Today: {datetime.datetime.now().date()}")
 
+    vetoed = set()
     try:
-        articles = load_articles_from_sheets(loadAll=loadAll)
+        if fromStore:
+            articles = load_articles_from_store(loadAll=loadAll, vetoed=vetoed)
+        else:
+            articles = load_articles_from_sheets(loadAll=loadAll, vetoed=vetoed)
     except Exception as e:
-        print(f"❌ Error loading from Google Sheets: {e}")
+        print(f"❌ Error loading from {'article store' if fromStore else 'Google Sheets'}: {e}")
         return
 
-    rss = Element('rss', {
-        'version': '2.0',
-        'xmlns:media': 'http://search.yahoo.com/mrss/'
-    })
-    channel = SubElement(rss, 'channel')
-
-    SubElement(channel, 'title').text = FEED_TITLE
-    SubElement(channel, 'link').text = SITE_URL
-    SubElement(channel, 'description').text = FEED_DESCRIPTION
-    SubElement(channel, 'lastBuildDate').text = datetime.datetime.utcnow().strftime('%a, %d %b %Y %H:%M:%S +0000')
-
-    for article in articles:
-        item = SubElement(channel, 'item')
-        SubElement(item, 'title').text = article.get('title', '')
-        SubElement(item, 'link').text = article.get('link', '')
-        SubElement(item, 'guid').text = article.get('link', '')
-        SubElement(item, 'description').text = article.get('caption', '')
-        SubElement(item, 'pubDate').text = article.get('published', '')
-
-        # ✅ Add image if available
-        image_url = article.get('image')
-        if image_url:
-            SubElement(item, 'media:content', {
-                'url': image_url,
-                'medium': 'image'
-            })
-
     output_file = _get_output_file(loadAll)
-    tree = ElementTree(rss)
-    tree.write(output_file, encoding='utf-8', xml_declaration=True)
-    print(f"\n✅ RSS feed written to {output_file} using {len(articles)} item(s)")
-
+    if loadAll:
+        # The archive only grows: merge today's selects into the existing file.
+        written = merge_rss(articles, output_file, drop_guids=vetoed)
+    else:
+        written = write_rss(articles, output_file)
+    print(f"\n✅ RSS feed written to {output_file} using {written} item(s)")
 
 if __name__ == '__main__':
     import argparse
     arg_parser = argparse.ArgumentParser()
     arg_parser.add_argument("--loadAll", action="store_true", help="Load all articles")
+    arg_parser.add_argument("--fromStore", action="store_true", help="Read selects from the local article store")
     args = arg_parser.parse_args()
-    generate_rss(loadAll=args.loadAll)
+    generate_rss(loadAll=args.loadAll, fromStore=args.fromStore)
+    instrumentation.write_report()
@@ -0,0 +1,50 @@
+import time
+import instrumentation
+import rss_scraper_bot
+import gpt_top_article_selector
+import caption_generator
+import sheets_sync
+import rss_writer
+
+# --- STAGE TIMING ---
+class StageTimer:
+    def __init__(self):
+        self.timings = []
+
+    def run(self, name, fn, *args, **kwargs):
+        print(f"\n▶️ Stage: {name}")
+        start = time.perf_counter()
+        try:
+            with instrumentation.span(name):
+                return fn(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.timings.append((name, elapsed))
+            print(f"⏱️ {name} finished in {elapsed:.2f}s")
+
+    def report(self):
+        total = sum(elapsed for _, elapsed in self.timings)
+        print("\n📊 Pipeline timings:")
+        for name, elapsed in self.timings:
+            share = elapsed / total * 100 if total else 0
+            print(f"   {name:<10} {elapsed:8.2f}s  {share:5.1f}%")
+        print(f"   {'total':<10} {total:8.2f}s")
+
+# --- PIPELINE ---
+def run_pipeline():
+    # One process end to end: the Sheets and OpenAI clients are built once
+    # (clients.py) and each stage hands its articles to the next in memory.
+    timer = StageTimer()
+    try:
+        stories = timer.run('scrape', rss_scraper_bot.main)
+        top_five = timer.run('rank', gpt_top_article_selector.main, stories)
+        timer.run('caption', caption_generator.main, top_five)
+        timer.run('sync', sheets_sync.main)
+        timer.run('rss', rss_writer.generate_rss, loadAll=False, fromStore=True)
+        timer.run('rss_all', rss_writer.generate_rss, loadAll=True, fromStore=True)
+    finally:
+        timer.report()
+        instrumentation.write_report()
+
+if __name__ == '__main__':
+    run_pipeline()
@@ -0,0 +1,123 @@
+from dates import parse_date, utc_bounds
+
+# --- A1 HELPERS ---
+def col_letter(col):
+    letters = ''
+    while col > 0:
+        col, rem = divmod(col - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+def contiguous_runs(indices):
+    runs = []
+    for i in sorted(indices):
+        if runs and runs[-1][1] == i:
+            runs[-1][1] = i + 1
+        else:
+            runs.append([i, i + 1])
+    return [tuple(r) for r in runs]
+
+def _row_data(values):
+    return {'values': [{'userEnteredValue': {'stringValue': '' if v is None else str(v)}} for v in values]}
+
+# --- REQUEST BUILDERS ---
+def delete_rows_requests(sheet_id, row_indices):
+    # Delete bottom-up so earlier ranges keep their indices.
+    return [
+        {'deleteDimension': {'range': {
+            'sheetId': sheet_id, 'dimension': 'ROWS', 'startIndex': start, 'endIndex': end
+        }}}
+        for start, end in reversed(contiguous_runs(row_indices))
+    ]
+
+def update_cells_request(sheet_id, row_index, col_index, rows):
+    return {'updateCells': {
+        'start': {'sheetId': sheet_id, 'rowIndex': row_index, 'columnIndex': col_index},
+        'rows': [_row_data(row) for row in rows],
+        'fields': 'userEnteredValue',
+    }}
+
+def update_header_request(sheet_id, headers):
+    return update_cells_request(sheet_id, 0, 0, [headers])
+
+def append_columns_request(sheet_id, length):
+    return {'appendDimension': {'sheetId': sheet_id, 'dimension': 'COLUMNS', 'length': length}}
+
+def append_rows_request(sheet_id, rows):
+    return {'appendCells': {
+        'sheetId': sheet_id,
+        'rows': [_row_data(row) for row in rows],
+        'fields': 'userEnteredValue',
+    }}
+
+# --- GRID SIZE ---
+# Writes past the grid's last column are rejected, and older tabs were
+# created narrower than today's headers.
+def grid_requests(worksheet, width):
+    missing = width - worksheet.col_count
+    return [append_columns_request(worksheet.id, missing)] if missing > 0 else []
+
+# --- DAY BLOCK REPLACEMENT ---
+def find_rows_for_date(date_cells, date_str, tz, iso_cells=None):
+    # date_cells is the column read from row 2 down; returns 0-based grid row indices.
+    # Rows with a normalized ISO UTC value are matched by string range; older
+    # rows without one fall back to parsing the free-form date.
+    iso_cells = iso_cells or []
+    start, end = utc_bounds(date_str, tz)
+    matches = []
+    for offset in range(max(len(date_cells), len(iso_cells))):
+        iso = iso_cells[offset][0] if offset < len(iso_cells) and iso_cells[offset] else ''
+        if iso:
+            if start <= iso < end:
+                matches.append(offset + 1)
+            continue
+        cell = date_cells[offset] if offset < len(date_cells) else []
+        value = cell[0] if cell else ''
+        if not value:
+            continue
+        try:
+            parsed_date = parse_date(value).astimezone(tz).date()
+        except Exception as e:
+            print(f"Error parsing row date: {value} -> {e}")
+            continue
+        if parsed_date.strftime('%Y-%m-%d') == date_str:
+            matches.append(offset + 1)
+    return matches
+
+def _header_requests(worksheet, header_range, default_headers, new_rows=()):
+    # The grid is widened in the same batch, ahead of the header and rows that need it.
+    headers = list(header_range[0]) if header_range else []
+    missing = [h for h in default_headers if h not in headers]
+    requests = []
+    if missing:
+        headers += missing
+        requests.append(update_header_request(worksheet.id, headers))
+    width = max([len(headers)] + [len(row) for row in new_rows])
+    return grid_requests(worksheet, width) + requests
+
+def replace_day_rows(worksheet, default_headers, date_col, date_str, tz, new_rows, iso_col=None):
+    date_letter = col_letter(date_col)
+    ranges = ['1:1', f'{date_letter}2:{date_letter}']
+    if iso_col:
+        ranges.append(f'{col_letter(iso_col)}2:{col_letter(iso_col)}')
+    header_range, date_cells, *iso_cells = worksheet.batch_get(ranges)
+    requests = _header_requests(worksheet, header_range, default_headers, new_rows)
+
+    stale_rows = find_rows_for_date(date_cells, date_str, tz, iso_cells[0] if iso_cells else None)
+    print(f"Removed {len(stale_rows)} rows from {date_str}")
+    requests += delete_rows_requests(worksheet.id, stale_rows)
+    if new_rows:
+        requests.append(append_rows_request(worksheet.id, new_rows))
+
+    if requests:
+        worksheet.spreadsheet.batch_update({'requests': requests})
+    return len(stale_rows), len(new_rows)
+
+def append_rows(worksheet, default_headers, new_rows):
+    header_range, = worksheet.batch_get(['1:1'])
+    requests = _header_requests(worksheet, header_range, default_headers, new_rows)
+    if new_rows:
+        requests.append(append_rows_request(worksheet.id, new_rows))
+    if requests:
+        worksheet.spreadsheet.batch_update({'requests': requests})
+    return len(new_rows)
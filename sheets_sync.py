@@ -0,0 +1,215 @@
+import datetime
+import pytz
+import article_store
+import clients
+from article_store import ArticleStore
+from dates import iso_utc, parse_iso_utc
+from sheets_batch import (append_rows, append_rows_request, col_letter, delete_rows_requests, grid_requests,
+                          update_cells_request, update_header_request)
+
+GOOGLE_SHEET_NAME = 'InYourBones Daily Music News'
+PACIFIC = pytz.timezone("America/Los_Angeles")
+MONTHLY_HEADERS = ['Title', 'Link', 'Source', 'Published', 'Image', 'Published UTC']
+SELECTS_HEADERS = ['Title', 'Link', 'Source', 'Published', 'Caption', 'Image', 'Approval', 'Published UTC']
+
+APPROVAL_TO_STATUS = {
+    '✅': article_store.APPROVED,
+    '✅ Approved': article_store.APPROVED,
+    '❌': article_store.VETOED,
+    '🚫 Vetoed': article_store.VETOED,
+}
+# Every Approval value that vetoes a row, for the loaders that read the tab themselves.
+VETO_MARKS = frozenset(mark for mark, status in APPROVAL_TO_STATUS.items() if status == article_store.VETOED)
+STATUS_TO_APPROVAL = {
+    article_store.APPROVED: '✅',
+    article_store.VETOED: '❌',
+}
+# Where this repo's selects tabs keep the columns the sync compares.
+SYNC_COLUMNS = {'Link': 1, 'Caption': 4, 'Approval': 6}
+
+# --- HELPERS ---
+def _month_tab(day, selects=False):
+    tab = datetime.date.fromisoformat(day).strftime('%B %Y')
+    return f"{tab} (selects)" if selects else tab
+
+def _today():
+    return datetime.datetime.now(PACIFIC).date().isoformat()
+
+def _selected_on(published_utc, published, tab_day):
+    # Stories are picked the morning after they run (PST), so a row pulled from a
+    # selects tab is dated the day after publication, kept within the tab's month.
+    iso = iso_utc(published_utc) or iso_utc(published)
+    first = datetime.date.fromisoformat(tab_day).replace(day=1)
+    if not iso:
+        return first.isoformat()
+    day = parse_iso_utc(iso).astimezone(PACIFIC).date() + datetime.timedelta(days=1)
+    last = (first + datetime.timedelta(days=31)).replace(day=1) - datetime.timedelta(days=1)
+    return min(max(day, first), last).isoformat()
+
+def _worksheet(spreadsheet, title, headers):
+    import gspread
+    try:
+        return spreadsheet.worksheet(title)
+    except gspread.exceptions.WorksheetNotFound:
+        return spreadsheet.add_worksheet(title=title, rows="1000", cols=str(len(headers)))
+
+def _selects_snapshot(worksheet):
+    # Link, Caption and Approval by row, read without downloading the whole tab.
+    # Tabs written by this repo keep them at B, E and G, so one batch_get
+    # normally covers it; other layouts cost one more read.
+    ranges = [f'{col_letter(i + 1)}2:{col_letter(i + 1)}' for i in SYNC_COLUMNS.values()]
+    header_range, *cells = worksheet.batch_get(['1:1'] + ranges)
+    headers = list(header_range[0]) if header_range else []
+    found = {name: headers.index(name) for name in SYNC_COLUMNS if name in headers}
+    columns = dict(zip(SYNC_COLUMNS, cells))
+    moved = [name for name, i in found.items() if i != SYNC_COLUMNS[name]]
+    if moved:
+        letters = [col_letter(found[name] + 1) for name in moved]
+        columns.update(zip(moved, worksheet.batch_get([f'{letter}2:{letter}' for letter in letters])))
+
+    def value(name, offset):
+        cells = columns[name] if name in found else []
+        return cells[offset][0].strip() if offset < len(cells) and cells[offset] else ''
+
+    rows = {}
+    for offset in range(len(columns['Link']) if 'Link' in found else 0):
+        link = value('Link', offset)
+        if link and link not in rows:
+            rows[link] = (offset + 2, value('Caption', offset), value('Approval', offset))
+    return {'worksheet': worksheet, 'headers': headers, 'rows': rows}
+
+def _group_by_tab(articles, day_field, selects=False):
+    tabs = {}
+    for a in articles:
+        if a.get(day_field):
+            tabs.setdefault(_month_tab(a[day_field], selects), []).append(a)
+    return tabs
+
+# --- PUSH ---
+def push_monthly(store, spreadsheet):
+    pushed = []
+    for tab, articles in _group_by_tab(store.dirty(), 'scraped_on').items():
+        worksheet = _worksheet(spreadsheet, tab, MONTHLY_HEADERS)
+        link_cells, = worksheet.batch_get(['B2:B'])
+        existing = {cell[0].strip() for cell in link_cells if cell}
+        new_rows = [[a['title'], a['link'], a['source'], a['published'], a['image'], iso_utc(a['published'])]
+                    for a in articles if a['link'] not in existing]
+        if new_rows:
+            append_rows(worksheet, MONTHLY_HEADERS, new_rows)
+        print(f"🔄 {tab}: appended {len(new_rows)} missing row(s)")
+        pushed += [a['link'] for a in articles]
+    return pushed
+
+def push_selects(store, spreadsheet, snapshots=None):
+    pushed = []
+    snapshots = snapshots or {}
+    for tab, articles in _group_by_tab(store.dirty(), 'selected_on', selects=True).items():
+        snapshot = snapshots.pop(tab, None) or _selects_snapshot(_worksheet(spreadsheet, tab, SELECTS_HEADERS))
+        worksheet, row_by_link = snapshot['worksheet'], snapshot['rows']
+        headers = list(snapshot['headers'])
+        missing = [h for h in SELECTS_HEADERS if h not in headers]
+        headers += missing
+        caption_col, approval_col = headers.index('Caption'), headers.index('Approval')
+
+        updates, stale, new_rows = [], [], []
+        for a in articles:
+            approval = STATUS_TO_APPROVAL.get(a['status'], '')
+            if a['link'] in row_by_link:
+                row_num, caption, current = row_by_link[a['link']]
+                if a['status'] == article_store.SCRAPED:
+                    # Dropped by a same-day rerun of the selector.
+                    stale.append(row_num - 1)
+                    continue
+                if a['caption'] and caption != a['caption']:
+                    updates.append(update_cells_request(worksheet.id, row_num - 1, caption_col, [[a['caption']]]))
+                if approval and APPROVAL_TO_STATUS.get(current) != a['status']:
+                    updates.append(update_cells_request(worksheet.id, row_num - 1, approval_col, [[approval]]))
+            elif a['status'] != article_store.SCRAPED:
+                row = [''] * len(headers)
+                row[:4] = [a['title'], a['link'], a['source'], a['published']]
+                row[caption_col] = a['caption'] or ''
+                row[approval_col] = approval
+                row[headers.index('Image')] = a['image'] or ''
+                row[headers.index('Published UTC')] = iso_utc(a['published'])
+                new_rows.append(row)
+
+        # One atomic batchUpdate per tab: widen older, narrower tabs, fix the
+        # header, update cells, delete rerun leftovers bottom-up, then append.
+        batch = grid_requests(worksheet, len(headers))
+        if missing:
+            batch.append(update_header_request(worksheet.id, headers))
+        batch += updates + delete_rows_requests(worksheet.id, stale)
+        if new_rows:
+            batch.append(append_rows_request(worksheet.id, new_rows))
+        if batch:
+            spreadsheet.batch_update({'requests': batch})
+        print(f"🔄 {tab}: {len(updates)} cell update(s), {len(stale)} removed, {len(new_rows)} appended row(s)")
+        pushed += [a['link'] for a in articles]
+    return pushed
+
+def push(store, spreadsheet, snapshots=None):
+    selects = push_selects(store, spreadsheet, snapshots)
+    monthly = push_monthly(store, spreadsheet)
+    store.mark_synced(set(selects) | set(monthly))
+    print(f"✅ Pushed {len(set(selects) | set(monthly))} dirty article(s) to Google Sheets")
+
+# --- PULL ---
+def pull_selects(store, spreadsheet, day=None, snapshots=None):
+    # Bring dashboard edits (captions, approvals) from the selects tab into the store.
+    day = day or _today()
+    tab = _month_tab(day, selects=True)
+    import gspread
+    try:
+        worksheet = spreadsheet.worksheet(tab)
+    except gspread.exceptions.WorksheetNotFound:
+        return 0
+    snapshot = _selects_snapshot(worksheet)
+    if snapshots is not None:
+        snapshots[tab] = snapshot
+    rows = snapshot['rows']
+    status_of = lambda approval: APPROVAL_TO_STATUS.get(approval, article_store.SELECTED)
+
+    known = store.known_links(rows)
+    store.apply_sheet_edits([(link, caption, status_of(approval))
+                             for link, (_, caption, approval) in rows.items() if link in known])
+
+    # Rows the store has never seen (picked before it existed, or added by hand)
+    # are fetched whole, one range per row in a single call.
+    unknown = [link for link in rows if link not in known]
+    pulled = []
+    if unknown:
+        headers = snapshot['headers']
+        last = col_letter(len(headers))
+        col = lambda name: headers.index(name) if name in headers else None
+        image_col, iso_col = col('Image'), col('Published UTC')
+        full_rows = worksheet.batch_get([f'A{rows[link][0]}:{last}{rows[link][0]}' for link in unknown])
+        for link, cells in zip(unknown, full_rows):
+            row = cells[0] if cells else []
+            if len(row) < 4:
+                continue
+            _, caption, approval = rows[link]
+            image = row[image_col].strip() if image_col is not None and len(row) > image_col else ''
+            iso = row[iso_col].strip() if iso_col is not None and len(row) > iso_col else ''
+            pulled.append((row[0], link, row[2], row[3], caption, image, status_of(approval),
+                           _selected_on(iso, row[3], day)))
+        store.apply_sheet_rows(pulled)
+    print(f"⬇️ Pulled {len(rows)} row(s) from '{tab}' ({len(pulled)} new to the store)")
+    return len(rows)
+
+# --- MAIN ---
+def main(pull_only=False, store=None):
+    store = store or ArticleStore()
+    spreadsheet = clients.spreadsheet(GOOGLE_SHEET_NAME)
+    # The push reuses the pull's column read, so the current selects tab is read once.
+    snapshots = {}
+    pull_selects(store, spreadsheet, snapshots=snapshots)
+    if not pull_only:
+        push(store, spreadsheet, snapshots)
+
+if __name__ == '__main__':
+    import argparse
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--pull-only", action="store_true", help="Only pull dashboard edits into the store")
+    args = arg_parser.parse_args()
+
+    main(pull_only=args.pull_only)
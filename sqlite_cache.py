@@ -0,0 +1,91 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+
+# --- CONFIG ---
+CACHE_DIR = os.getenv("CACHE_DIR", ".cache")
+PRUNE_EVERY = 100
+
+# --- SQLITE-BACKED TTL/LRU CACHE ---
+class SqliteCache:
+    def __init__(self, path, ttl=None, max_entries=None):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT,"
+            " expires_at REAL,"
+            " accessed_at REAL)"
+        )
+        self._connect().execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed_at)")
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # One connection per thread; WAL plus a busy timeout lets
+            # overlapping runs and worker threads write without clobbering.
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key):
+        now = time.time()
+        conn = self._connect()
+        row = conn.execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None or (row[1] is not None and row[1] < now):
+            self._count(False)
+            return False, None
+        conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+        self._count(True)
+        return True, json.loads(row[0])
+
+    def set(self, key, value, ttl=None):
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = now + ttl if ttl else None
+        self._connect().execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value), expires_at, now)
+        )
+        with self._lock:
+            self._writes += 1
+            should_prune = self._writes % PRUNE_EVERY == 0
+        if should_prune:
+            self.prune()
+
+    def prune(self):
+        conn = self._connect()
+        conn.execute("DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at < ?", (time.time(),))
+        if self.max_entries:
+            conn.execute(
+                "DELETE FROM cache WHERE key IN ("
+                " SELECT key FROM cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def clear(self):
+        self._connect().execute("DELETE FROM cache")
+
+    def __len__(self):
+        return self._connect().execute("SELECT COUNT(*) FROM cache").fetchone()[0]
@@ -0,0 +1,148 @@
+import re
+from collections import defaultdict
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+# --- CONFIG ---
+MIN_SHARED_TOKENS = 2
+MIN_OVERLAP = 0.5
+MIN_JACCARD = 0.6
+MAX_POSTING = 50
+
+STOPWORDS = {
+    'a', 'an', 'the', 'and', 'or', 'but', 'of', 'to', 'in', 'on', 'at', 'for', 'with', 'by', 'from',
+    'as', 'is', 'are', 'was', 'be', 'his', 'her', 'their', 'its', 'it', 'he', 'she', 'they', 'this',
+    'that', 'after', 'about', 'into', 'over', 'up', 'out', 'how', 'why', 'what', 'who', 'will', 'has',
+    'have', 'at', 'vs', 'x', 'ft', 'feat', 'new', 'first', 'more', 'all', 'just', 'now', 'not', 'no',
+}
+# Words that show up in almost every music headline and say nothing about the story.
+GENERIC_WORDS = {
+    'album', 'albums', 'song', 'songs', 'single', 'video', 'music', 'tour', 'tours', 'announces',
+    'announce', 'announced', 'shares', 'share', 'release', 'releases', 'released', 'releasing',
+    'watch', 'listen', 'stream', 'debut', 'debuts', 'live', 'performance', 'performs', 'perform',
+    'dates', 'date', 'show', 'shows', 'news', 'band', 'singer', 'rapper', 'star', 'year', 'says',
+    'reveals', 'details', 'drops', 'new', 'official', 'track', 'tracks', 'ep', 'lp',
+}
+TRACKING_PARAMS = re.compile(r'^(utm_|fbclid$|gclid$|mc_|ref$|src$|cmp$)')
+TOKEN_RE = re.compile(r"[\w][\w'’\-]*")
+
+# --- NORMALIZATION ---
+def canonical_link(link):
+    parts = urlsplit((link or '').strip())
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parts.query) if not TRACKING_PARAMS.match(k)))
+    path = parts.path.rstrip('/')
+    return f"{host}{path}" + (f"?{query}" if query else '')
+
+def _normalize(token):
+    token = token.lower().replace('’', "'")
+    if token.endswith("'s"):
+        token = token[:-2]
+    return token.strip("'-")
+
+def story_tokens(title):
+    # (content set, artist-like set, non-stopword tokens in title order)
+    content, artists, ordered = set(), set(), []
+    for raw in TOKEN_RE.findall(title or ''):
+        token = _normalize(raw)
+        if not token or token in STOPWORDS:
+            continue
+        ordered.append(token)
+        if token in GENERIC_WORDS:
+            continue
+        content.add(token)
+        if raw[0].isupper() or raw.isdigit():
+            artists.add(token)
+    return content, artists, tuple(ordered)
+
+def _leading_name(a, b):
+    # Headlines about an act usually open with its name and then a verb like
+    # "announces"; in Title Case every token looks artist-like, so the opening
+    # run both titles share, up to the first generic word, stands in for it.
+    name = set()
+    for x, y in zip(a[2], b[2]):
+        if x != y or x in GENERIC_WORDS:
+            break
+        name.add(x)
+    return name
+
+def same_story(a, b):
+    shared = a[0] & b[0]
+    if len(shared) < MIN_SHARED_TOKENS:
+        return False
+    # Sharing only the act's name means two stories about the same artist,
+    # not one story twice: the scores are taken over what the headlines say.
+    name = _leading_name(a, b)
+    event_a, event_b = a[0] - name, b[0] - name
+    shared_event = shared - name
+    if not shared_event:
+        return False
+    if len(shared_event) / len(event_a | event_b) >= MIN_JACCARD:
+        return True
+    overlap = len(shared_event) / min(len(event_a), len(event_b))
+    return overlap >= MIN_OVERLAP and bool(shared & a[1] & b[1])
+
+# --- UNION-FIND ---
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+def _union(parent, i, j):
+    ri, rj = _find(parent, i), _find(parent, j)
+    if ri != rj:
+        parent[max(ri, rj)] = min(ri, rj)
+
+# --- CLUSTERING ---
+def cluster_articles(articles):
+    parent = list(range(len(articles)))
+    features = [story_tokens(a.get('title', '')) for a in articles]
+
+    by_link = {}
+    postings = defaultdict(list)
+    for i, article in enumerate(articles):
+        link = canonical_link(article.get('link'))
+        if link in by_link:
+            _union(parent, by_link[link], i)
+        elif link:
+            by_link[link] = i
+
+        # Only compare against earlier headlines sharing a reasonably rare token,
+        # which keeps the candidate set small and the pass roughly linear.
+        candidates = set()
+        for token in features[i][0]:
+            posting = postings[token]
+            if len(posting) < MAX_POSTING:
+                candidates.update(posting)
+            posting.append(i)
+        for j in candidates:
+            if _find(parent, i) != _find(parent, j) and same_story(features[i], features[j]):
+                _union(parent, i, j)
+
+    groups = defaultdict(list)
+    for i in range(len(articles)):
+        groups[_find(parent, i)].append(i)
+
+    stories = []
+    for root in sorted(groups):
+        members = groups[root]
+        # The newest member speaks for the story; if it has no image yet,
+        # borrow one from another report of the same story.
+        rep = max(members, key=lambda i: (articles[i].get('published_utc', ''), -i))
+        story = dict(articles[rep])
+        if not story.get('image'):
+            story['image'] = next((articles[i]['image'] for i in members if articles[i].get('image')), story.get('image', ''))
+        if len(members) > 1:
+            story['sources'] = list(dict.fromkeys(articles[i].get('source', '') for i in members))
+            story['related'] = [
+                {'title': articles[i].get('title', ''), 'link': articles[i].get('link', ''),
+                 'source': articles[i].get('source', '')}
+                for i in members if i != rep
+            ]
+        stories.append(story)
+
+    merged = len(articles) - len(stories)
+    print(f"🧩 Clustered {len(articles)} articles into {len(stories)} stories ({merged} near-duplicates folded)")
+    return stories
@@ -0,0 +1,53 @@
+import numpy as np
+
+# --- CONFIG ---
+MAX_SHARED_KEYWORDS = 3
+
+# --- TOKENIZATION ---
+def title_tokens(title):
+    return set(title.lower().split())
+
+# --- SIMILARITY INDEX ---
+class TitleSimilarityIndex:
+    def __init__(self, titles, max_shared=MAX_SHARED_KEYWORDS):
+        self.titles = list(titles)
+        self.max_shared = max_shared
+        self.position = {}
+        vocab = {}
+        rows, cols = [], []
+        for i, title in enumerate(self.titles):
+            self.position.setdefault(title, i)
+            for token in title_tokens(title):
+                rows.append(i)
+                cols.append(vocab.setdefault(token, len(vocab)))
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+
+        # Inverted index: postings[starts[t]:starts[t + 1]] are the titles containing token t.
+        order = np.argsort(cols, kind='stable')
+        self._postings = rows[order]
+        self._starts = np.searchsorted(cols[order], np.arange(len(vocab) + 1))
+        # Per-title token ids, in the same CSR layout.
+        self._title_tokens = cols
+        self._title_starts = np.searchsorted(rows, np.arange(len(self.titles) + 1))
+
+        # Largest keyword overlap between each title and anything chosen so far.
+        self._max_overlap = np.zeros(len(self.titles), dtype=np.int32)
+        self.chosen = np.zeros(len(self.titles), dtype=bool)
+
+    def index_of(self, title):
+        return self.position.get(title)
+
+    def is_too_similar(self, i):
+        return bool(self._max_overlap[i] >= self.max_shared)
+
+    def choose(self, i):
+        tokens = self._title_tokens[self._title_starts[i]:self._title_starts[i + 1]]
+        if len(tokens):
+            hits = np.concatenate([self._postings[self._starts[t]:self._starts[t + 1]] for t in tokens])
+            overlap = np.bincount(hits, minlength=len(self.titles))
+            np.maximum(self._max_overlap, overlap, out=self._max_overlap)
+        self.chosen[i] = True
+
+    def diverse_candidates(self):
+        return np.flatnonzero(~self.chosen & (self._max_overlap < self.max_shared))